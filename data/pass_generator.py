@@ -1,4 +1,5 @@
-import requests
+import asyncio
+import httpx
 import os
 from pathlib import Path
 
@@ -39,17 +40,34 @@ body = {
     }
 }
 
-# Send POST request 10 times and store IDs only
-results_file = Path("results.txt")
-with open(results_file, "w") as f:
-    for i in range(10):
-        try:
-            response = requests.post(url, headers=headers, json=body)
-            response.raise_for_status()
-            data = response.json()
-            if "client_secret" in data:
-                f.write(f"Request {i+1} client_secret: {data['client_secret']}\n")
-            else:
-                f.write(f"Request {i+1}: 'client_secret' not found in response\n")
-        except Exception as e:
-            f.write(f"Request {i+1} failed: {e}\n")
+NUM_REQUESTS = 10
+
+
+async def post_one(client: httpx.AsyncClient, i: int) -> str:
+    """Send a single POST and describe its outcome as a results line."""
+    try:
+        response = await client.post(url, json=body)
+        response.raise_for_status()
+        data = response.json()
+        if "client_secret" in data:
+            return f"Request {i+1} client_secret: {data['client_secret']}\n"
+        return f"Request {i+1}: 'client_secret' not found in response\n"
+    except Exception as e:
+        return f"Request {i+1} failed: {e}\n"
+
+
+async def main():
+    # All requests share one pooled client and run concurrently
+    transport = httpx.AsyncHTTPTransport(retries=3)
+    limits = httpx.Limits(max_connections=NUM_REQUESTS)
+    async with httpx.AsyncClient(headers=headers, transport=transport, limits=limits) as client:
+        results = await asyncio.gather(*(post_one(client, i) for i in range(NUM_REQUESTS)))
+
+    # Store IDs only, in a single write
+    results_file = Path("results.txt")
+    with open(results_file, "w") as f:
+        f.writelines(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,14 @@
+"""
+Shared FastAPI dependencies.
+
+Every route module takes its database session from here, so session
+configuration lives in one place (src/db/database.py).
+"""
+from src.db.database import SessionLocal
+
+
+# Dependency that provides a database session for each request
+def get_db():
+    # The session is closed (and its connection returned to the pool) once the response is sent
+    with SessionLocal() as db:
+        yield db
@@ -20,32 +20,66 @@ Architecture:
 """
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from typing import Literal, Optional
+from contextlib import asynccontextmanager
 from pathlib import Path
-import shutil
+import asyncio
 import uuid
+import io
 import os
 
 from src.api.routes import history, summary, comparison, health, metrics, batch, config, webhooks
 from src.api.middleware.logging import RequestLoggingMiddleware
-from src.api.middleware.rate_limit import RateLimitMiddleware
+from src.api.middleware.rate_limit import RateLimitMiddleware, close_redis_clients
+from src.api.responses import ORJSONResponse
 from src.core.data_loader import load_data
 from src.core.generate_sample_report import generate_data_quality_report
 from src.core.url_loader import download_file_from_url
+from src.core.http_client import get_http_client, close_http_client
+from src.api.routes.webhooks import start_webhook_workers, stop_webhook_workers
+from src.core.utils.file_utils import copy_upload_to_path, UPLOAD_DIR
+from src.db.database import init_db
 
 # Get rate limit from environment or use default
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
 
+# Optional Redis URL to share rate limits across workers (in-memory if unset)
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Responses smaller than this (bytes) are sent uncompressed
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+# Uploads smaller than this are processed in memory instead of via a temp file
+MAX_IN_MEMORY_UPLOAD_BYTES = int(os.getenv("MAX_IN_MEMORY_UPLOAD_BYTES", str(32 * 1024 * 1024)))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    init_db()
+    # Create the shared pooled HTTP client up front, on the app's event loop
+    get_http_client()
+    start_webhook_workers()
+    yield
+    # Deliver queued webhook events before the client is closed
+    await stop_webhook_workers()
+    # Release pooled outgoing connections
+    await close_http_client()
+    await close_redis_clients()
+
+
 app = FastAPI(
     title="Data Quality Checker API",
     description="Professional data quality analysis tool with validation, ML recommendations, and comprehensive reporting",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS configuration - more secure defaults
@@ -54,12 +88,17 @@ app = FastAPI(
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
 cors_origins = [origin.strip() for origin in cors_origins if origin.strip()]
 
+# Gzip responses for clients that accept it (JSON lists compress several times over).
+# Added first so it wraps the app directly and sees complete responses, which
+# keeps small ones under GZIP_MINIMUM_SIZE uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=5)
+
 # Add middleware in order (first added is last executed)
 # Request logging should be first (outermost)
 app.add_middleware(RequestLoggingMiddleware)
 
 # Rate limiting
-app.add_middleware(RateLimitMiddleware, requests_per_minute=RATE_LIMIT_PER_MINUTE)
+app.add_middleware(RateLimitMiddleware, requests_per_minute=RATE_LIMIT_PER_MINUTE, redis_url=REDIS_URL)
 
 # CORS (should be last)
 app.add_middleware(
@@ -115,25 +154,34 @@ async def upload_data(
 ):
     temp_file_path = None
     try:
-        # Save uploaded file to a temporary folder
-        temp_dir = Path("tmp/uploads")
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        temp_file_path = temp_dir / f"{uuid.uuid4()}_{file.filename}"
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Generate report with given parameters
-        paths = generate_data_quality_report(
-            input_path=temp_file_path,
+        # Unique name so concurrent uploads of the same file get separate reports
+        upload_name = f"{uuid.uuid4().hex}_{file.filename}"
+        input_buffer = None
+
+        if file.size is not None and file.size < MAX_IN_MEMORY_UPLOAD_BYTES:
+            # Small files are analysed straight from memory, skipping the disk round-trip
+            input_path = Path(upload_name)
+            input_buffer = io.BytesIO(await file.read())
+        else:
+            # Save uploaded file to a temporary folder
+            temp_file_path = UPLOAD_DIR / upload_name
+            # Copy in a worker thread so large uploads don't block the event loop
+            await asyncio.to_thread(copy_upload_to_path, file.file, temp_file_path)
+            input_path = temp_file_path
+
+        # Generate report in a worker thread so the analysis doesn't block the event loop
+        paths = await asyncio.to_thread(
+            generate_data_quality_report,
+            input_path=input_path,
             report_format=report_format,
             include_ai=include_ai_insights,
-            client_name=client_name
+            client_name=client_name,
+            input_buffer=input_buffer
         )
 
         # Send webhook notification
         try:
-            from src.api.routes.webhooks import send_webhook, WebhookEvent
-            from src.api.routes.webhooks import webhooks as webhook_configs
+            from src.api.routes.webhooks import enqueue_webhooks, WebhookEvent
             
             session_id = paths.get("session_id")
             if session_id:
@@ -145,17 +193,16 @@ async def upload_data(
                     "report_paths": paths
                 }
                 
-                # Send to all configured webhooks
-                for webhook_id in webhook_configs.keys():
-                    await send_webhook(webhook_id, WebhookEvent.CHECK_COMPLETED, webhook_data)
+                # Delivered to all configured webhooks in the background
+                enqueue_webhooks(WebhookEvent.CHECK_COMPLETED, webhook_data)
         except Exception:
             # Don't fail if webhooks fail
             pass
 
-        return JSONResponse(content={
+        return {
             "message": f"✅ Report successfully generated from '{file.filename}'",
             "report_paths": paths
-        })
+        }
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"❌ {str(e)}")
@@ -187,8 +234,9 @@ async def upload_from_url(
         # Download file from URL
         temp_file_path = await download_file_from_url(url)
         
-        # Generate report with given parameters
-        paths = generate_data_quality_report(
+        # Generate report in a worker thread so the analysis doesn't block the event loop
+        paths = await asyncio.to_thread(
+            generate_data_quality_report,
             input_path=temp_file_path,
             report_format=report_format,
             include_ai=include_ai_insights,
@@ -196,11 +244,11 @@ async def upload_from_url(
         )
         
         filename = temp_file_path.name
-        return JSONResponse(content={
+        return {
             "message": f"✅ Report successfully generated from URL '{url[:50]}...'",
             "filename": filename,
             "report_paths": paths
-        })
+        }
     
     except HTTPException:
         # Re-raise HTTP exceptions as-is
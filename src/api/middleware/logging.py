@@ -1,13 +1,16 @@
 """
 Request logging middleware.
 """
+import atexit
 import logging
+import queue
 import time
-import json
+import orjson
 from datetime import datetime
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
+from logging.handlers import QueueHandler, QueueListener
 
 # Configure structured logging
 import os
@@ -17,13 +20,24 @@ from pathlib import Path
 logs_dir = Path("logs")
 logs_dir.mkdir(exist_ok=True)
 
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler(str(logs_dir / 'api.log'))
+stream_handler = logging.StreamHandler()
+for handler in (file_handler, stream_handler):
+    handler.setFormatter(log_formatter)
+
+# Loggers only enqueue records; the file/stream writes happen on the
+# listener's background thread so they never block the event loop
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(str(logs_dir / 'api.log')),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger("api")
@@ -35,38 +49,50 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
     
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        # Read the clocks once: monotonic for durations, wall clock for timestamps
+        start_time = time.monotonic()
+        start_wall = time.time()
         
-        # Log request
-        log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
-        }
+        # Fields shared by the request, response and error log lines
+        method = request.method
+        path = request.url.path
+        client_ip = request.client.host if request.client else None
         
-        logger.info(f"Request: {json.dumps(log_data)}")
+        # Skip building and serializing log lines nobody will consume
+        log_info = logger.isEnabledFor(logging.INFO)
+        
+        # Log request
+        if log_info:
+            log_data = {
+                "timestamp": datetime.utcfromtimestamp(start_wall).isoformat(),
+                "method": method,
+                "url": str(request.url),
+                "path": path,
+                "client_ip": client_ip,
+                "user_agent": request.headers.get("user-agent"),
+            }
+            
+            logger.info(f"Request: {orjson.dumps(log_data).decode()}")
         
         try:
             # Process request
             response = await call_next(request)
             
             # Calculate processing time
-            process_time = time.time() - start_time
+            process_time = time.monotonic() - start_time
             
             # Log response
-            response_log = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time_ms": round(process_time * 1000, 2),
-                "client_ip": request.client.host if request.client else None,
-            }
-            
-            logger.info(f"Response: {json.dumps(response_log)}")
+            if log_info:
+                response_log = {
+                    "timestamp": datetime.utcfromtimestamp(start_wall + process_time).isoformat(),
+                    "method": method,
+                    "path": path,
+                    "status_code": response.status_code,
+                    "process_time_ms": round(process_time * 1000, 2),
+                    "client_ip": client_ip,
+                }
+                
+                logger.info(f"Response: {orjson.dumps(response_log).decode()}")
             
             # Add header with process time
             response.headers["X-Process-Time"] = str(round(process_time, 3))
@@ -74,17 +100,16 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             return response
             
         except Exception as e:
-            process_time = time.time() - start_time
+            process_time = time.monotonic() - start_time
             
             error_log = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "method": request.method,
-                "path": request.url.path,
+                "timestamp": datetime.utcfromtimestamp(start_wall + process_time).isoformat(),
+                "method": method,
+                "path": path,
                 "error": str(e),
                 "error_type": type(e).__name__,
                 "process_time_ms": round(process_time * 1000, 2),
             }
             
-            logger.error(f"Error: {json.dumps(error_log)}")
+            logger.error(f"Error: {orjson.dumps(error_log).decode()}")
             raise
-
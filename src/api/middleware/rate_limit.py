@@ -4,62 +4,182 @@ Rate limiting middleware.
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
-from typing import Dict
-from collections import defaultdict
+from typing import Deque, List, Optional, Tuple
+from collections import OrderedDict, deque
+import logging
 import time
 from datetime import datetime, timedelta
 
-# In-memory rate limit storage (use Redis in production)
-rate_limit_storage: Dict[str, Dict] = defaultdict(dict)
+logger = logging.getLogger("api")
+
+# In-memory rate limit storage (used when no Redis URL is configured)
+# Maps client IP to the timestamps of its requests, oldest first.
+# Kept in least-recently-seen order so idle clients can be evicted from the front.
+rate_limit_storage: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+# Redis connect/read timeout (seconds), so an unreachable server fails fast
+REDIS_SOCKET_TIMEOUT = 0.5
+
+# After a Redis error, count in memory for this many seconds before retrying Redis
+REDIS_RETRY_INTERVAL = 30
+
+# Redis clients opened by middleware instances (closed on application shutdown)
+redis_clients: List = []
+
+
+async def close_redis_clients():
+    """Close the Redis clients used for rate limiting."""
+    while redis_clients:
+        await redis_clients.pop().aclose()
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Rate limiting middleware to prevent API abuse.
     Configurable via environment variables.
+    
+    Counts are kept in process memory by default. When a Redis URL is given,
+    a fixed one-minute window per client is kept in Redis instead, so the
+    limit is shared by all workers.
     """
     
-    def __init__(self, app, requests_per_minute: int = 60):
+    def __init__(
+        self,
+        app,
+        requests_per_minute: int = 60,
+        max_clients: int = 100_000,
+        redis_url: Optional[str] = None
+    ):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
         self.window_size = 60  # 1 minute window
+        self.max_clients = max_clients
+        # Constant header value, formatted once instead of per request
+        self._limit_header = str(requests_per_minute)
+        
+        self.redis = None
+        # Time until which Redis is skipped after a failure
+        self._redis_down_until = 0.0
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise ImportError("redis is required for shared rate limiting. Install it with: pip install redis")
+            self.redis = redis.from_url(
+                redis_url,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT
+            )
+            redis_clients.append(self.redis)
+    
+    def _get_timestamps(self, client_ip: str, window_start: float) -> Deque[float]:
+        """
+        Return the request timestamps for a client, evicting idle clients.
+        
+        The whole dispatch bookkeeping runs without awaiting, so it is not
+        interleaved with other requests on the event loop.
+        """
+        # Evict least recently seen clients with no requests in the window
+        while rate_limit_storage:
+            oldest_ip, oldest = next(iter(rate_limit_storage.items()))
+            if oldest and oldest[-1] >= window_start:
+                break
+            del rate_limit_storage[oldest_ip]
+        
+        timestamps = rate_limit_storage.get(client_ip)
+        if timestamps is None:
+            # Bound memory when many distinct clients are active at once
+            if len(rate_limit_storage) >= self.max_clients:
+                rate_limit_storage.popitem(last=False)
+            timestamps = rate_limit_storage[client_ip] = deque()
+        else:
+            rate_limit_storage.move_to_end(client_ip)
+        
+        return timestamps
+    
+    def _hit_memory(self, client_ip: str, current_time: float) -> Tuple[int, int]:
+        """
+        Count a request against the in-memory sliding window.
+        
+        Returns:
+            Tuple of (requests already in the window, seconds until a slot frees up).
+            The request is recorded only if it is within the limit.
+        """
+        window_start = current_time - self.window_size
+        
+        # Drop entries that fell out of the window (timestamps are ordered)
+        timestamps = self._get_timestamps(client_ip, window_start)
+        while timestamps and timestamps[0] < window_start:
+            timestamps.popleft()
+        
+        request_count = len(timestamps)
+        retry_after = int(self.window_size - (current_time - (timestamps[0] if timestamps else current_time)))
+        
+        # Record this request
+        if request_count < self.requests_per_minute:
+            timestamps.append(current_time)
+        
+        return request_count, retry_after
+    
+    async def _hit_redis(self, client_ip: str, current_time: float) -> Tuple[int, int]:
+        """
+        Count a request against a fixed window shared through Redis.
+        
+        Returns:
+            Tuple of (requests already in the window, seconds until the window resets)
+        """
+        window = int(current_time // self.window_size)
+        key = f"rl:{client_ip}:{window}"
+        
+        # INCR + EXPIRE in one round-trip; the key disappears after the window
+        pipe = self.redis.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, self.window_size * 2)
+        count, _ = await pipe.execute()
+        
+        retry_after = int((window + 1) * self.window_size - current_time)
+        return count - 1, retry_after
     
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health checks and test client
         if request.url.path.startswith("/health"):
             return await call_next(request)
         
+        # CORS preflight requests do no real work, don't count them against the quota
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        
+        # Get current time (once per request)
+        current_time = time.time()
+        
         # Skip rate limiting for test clients (identified by testclient user agent)
         user_agent = request.headers.get("user-agent", "")
         if isinstance(user_agent, str) and "testclient" in user_agent.lower():
             response = await call_next(request)
             # Add rate limit headers for consistency
-            response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Remaining"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Reset"] = str(int(time.time() + self.window_size))
+            response.headers["X-RateLimit-Limit"] = self._limit_header
+            response.headers["X-RateLimit-Remaining"] = self._limit_header
+            response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_size))
             return response
         
         # Get client identifier (IP address)
         client_ip = request.client.host if request.client else "unknown"
         
-        # Get current time
-        current_time = time.time()
-        window_start = current_time - self.window_size
-        
-        # Clean old entries
-        if client_ip in rate_limit_storage:
-            rate_limit_storage[client_ip] = {
-                k: v for k, v in rate_limit_storage[client_ip].items()
-                if v >= window_start
-            }
-        
-        # Count requests in current window
-        request_count = len(rate_limit_storage[client_ip])
+        # Count this client's earlier requests in the current window
+        request_count, retry_after = None, None
+        if self.redis is not None and current_time >= self._redis_down_until:
+            try:
+                request_count, retry_after = await self._hit_redis(client_ip, current_time)
+            except Exception as e:
+                # Fall back to per-process counting rather than failing requests,
+                # and don't wait on Redis again for a while
+                self._redis_down_until = current_time + REDIS_RETRY_INTERVAL
+                logger.warning(f"Redis rate limiting unavailable, retrying in {REDIS_RETRY_INTERVAL}s: {e}")
+        if request_count is None:
+            request_count, retry_after = self._hit_memory(client_ip, current_time)
         
         # Check rate limit
         if request_count >= self.requests_per_minute:
-            retry_after = int(self.window_size - (current_time - (min(rate_limit_storage[client_ip].values()) if rate_limit_storage[client_ip] else current_time)))
-            
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail={
@@ -68,22 +188,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "retry_after": retry_after
                 },
                 headers={
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
+                    "X-RateLimit-Limit": self._limit_header,
                     "X-RateLimit-Remaining": "0",
                     "X-RateLimit-Reset": str(int(current_time + retry_after)),
                     "Retry-After": str(retry_after)
                 }
             )
         
-        # Record this request
-        rate_limit_storage[client_ip][current_time] = current_time
-        
         # Process request
         response = await call_next(request)
         
         # Add rate limit headers
         remaining = max(0, self.requests_per_minute - request_count - 1)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+        response.headers["X-RateLimit-Limit"] = self._limit_header
         response.headers["X-RateLimit-Remaining"] = str(remaining)
         response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_size))
         
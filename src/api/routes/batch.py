@@ -2,17 +2,15 @@
 Batch processing endpoints for multiple files.
 """
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Literal
-from pathlib import Path
 import uuid
-import shutil
+import os
 import asyncio
 from datetime import datetime
 
+from src.api.responses import ORJSONResponse
 from src.core.generate_sample_report import generate_data_quality_report
-from src.api.routes.history import get_db
-from src.db.database import SessionLocal
+from src.core.utils.file_utils import copy_upload_to_path, UPLOAD_DIR
 
 router = APIRouter()
 
@@ -27,7 +25,8 @@ async def upload_batch(
     """
     Process multiple files in batch.
     
-    Accepts up to 10 files at once. Each file is processed sequentially.
+    Accepts up to 10 files at once. Files are processed concurrently in
+    worker threads (at most one per CPU core at a time).
     Returns results for all files processed.
     """
     if len(files) > 10:
@@ -36,49 +35,54 @@ async def upload_batch(
             detail="Maximum 10 files allowed per batch request"
         )
     
-    results = []
     temp_files = []
+    # Bound concurrent reports so a batch doesn't load every DataFrame at once
+    semaphore = asyncio.Semaphore(min(len(files), os.cpu_count() or 4))
+    
+    async def _process_one(file: UploadFile) -> Dict:
+        async with semaphore:
+            # Save uploaded file
+            temp_file_path = UPLOAD_DIR / f"{uuid.uuid4().hex}_{file.filename}"
+            temp_files.append(temp_file_path)
+            
+            # Copy in a worker thread, 1MB at a time, so the event loop stays free
+            await asyncio.to_thread(copy_upload_to_path, file.file, temp_file_path)
+            
+            # Generate report in a worker thread
+            paths = await asyncio.to_thread(
+                generate_data_quality_report,
+                input_path=temp_file_path,
+                report_format=report_format,
+                include_ai=include_ai_insights,
+                client_name=client_name
+            )
+            
+            return {
+                "filename": file.filename,
+                "status": "success",
+                "report_paths": paths
+            }
     
     try:
-        for file in files:
-            try:
-                # Save uploaded file
-                temp_dir = Path("tmp/uploads")
-                temp_dir.mkdir(parents=True, exist_ok=True)
-                temp_file_path = temp_dir / f"{uuid.uuid4()}_{file.filename}"
-                temp_files.append(temp_file_path)
-                
-                with open(temp_file_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
-                
-                # Generate report
-                paths = generate_data_quality_report(
-                    input_path=temp_file_path,
-                    report_format=report_format,
-                    include_ai=include_ai_insights,
-                    client_name=client_name
-                )
-                
-                results.append({
-                    "filename": file.filename,
-                    "status": "success",
-                    "report_paths": paths
-                })
-                
-            except Exception as e:
+        outcomes = await asyncio.gather(*(_process_one(file) for file in files), return_exceptions=True)
+        
+        results = []
+        for file, outcome in zip(files, outcomes):
+            if isinstance(outcome, Exception):
                 results.append({
                     "filename": file.filename,
                     "status": "error",
-                    "error": str(e)
+                    "error": str(outcome)
                 })
+            else:
+                results.append(outcome)
         
         successful_count = len([r for r in results if r["status"] == "success"])
         failed_count = len([r for r in results if r["status"] == "error"])
         
-        # Send batch completion webhook
+        # Queue batch completion webhook (delivered in the background)
         try:
-            from src.api.routes.webhooks import send_webhook, WebhookEvent
-            from src.api.routes.webhooks import webhooks as webhook_configs
+            from src.api.routes.webhooks import enqueue_webhooks, WebhookEvent
             
             batch_data = {
                 "total_files": len(files),
@@ -87,12 +91,11 @@ async def upload_batch(
                 "results": results
             }
             
-            for webhook_id in webhook_configs.keys():
-                await send_webhook(webhook_id, WebhookEvent.BATCH_COMPLETED, batch_data)
+            enqueue_webhooks(WebhookEvent.BATCH_COMPLETED, batch_data)
         except Exception:
             pass
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "message": f"Processed {len(files)} file(s)",
             "results": results,
             "total_files": len(files),
@@ -1,20 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from src.db.database import SessionLocal
+from src.api.deps import get_db
 from src.core.comparison import compare_sessions, get_quality_trend
 from typing import Optional
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/checks/compare")
 def compare_check_sessions(
     session_id1: int = Query(..., description="ID of the first session (older/previous)"),
@@ -42,8 +34,7 @@ def compare_check_sessions(
 @router.get("/checks/{session_id}/trend")
 def get_session_trend(
     session_id: int,
-    days_back: int = Query(30, description="Number of days to look back for comparison"),
-    db: Session = Depends(get_db)
+    days_back: int = Query(30, description="Number of days to look back for comparison")
 ):
     """
     Get quality trend for a session compared to previous sessions.
@@ -54,7 +45,8 @@ def get_session_trend(
         - Difference from average
         - Overall trend (improving/degrading/stable)
     """
-    result = get_quality_trend(session_id, days_back, db)
+    # No request session: get_quality_trend opens its own so the cached trend is used
+    result = get_quality_trend(session_id, days_back)
     
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
@@ -3,21 +3,18 @@ Configurable validation rules endpoints.
 """
 from fastapi import APIRouter, Depends, Body, HTTPException
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+import threading
+import time
 from sqlalchemy.orm import Session
+from src.api.deps import get_db
 from src.db.database import SessionLocal
+from src.db.models import ValidationConfigModel
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 class ValidationRule(BaseModel):
     """Validation rule configuration."""
     rule_name: str = Field(..., description="Name of the validation rule")
@@ -33,12 +30,77 @@ class ValidationConfig(BaseModel):
     description: Optional[str] = Field(None, description="Configuration description")
 
 
-# In-memory storage for validation configurations (use database in production)
-validation_configs: Dict[str, ValidationConfig] = {}
+# Validation configurations are stored in the database so they survive restarts
+# and are shared by all workers; init_db() creates the table at startup.
+
+# Per-process read cache of configurations. Writes only clear the cache of the
+# worker that handled them, so entries expire after CONFIG_CACHE_TTL seconds to
+# bound how long other workers can serve an outdated config.
+CONFIG_CACHE_SIZE = 256
+CONFIG_CACHE_TTL = 30.0
+
+# config_name -> (expires_at, config), least recently used first
+_config_cache: "OrderedDict[str, Tuple[float, ValidationConfig]]" = OrderedDict()
+# Handlers run in the threadpool; lookups, LRU reordering and evictions of
+# _config_cache happen under this lock so they can't interleave
+_config_lock = threading.Lock()
+
+# (expires_at, summaries) served by the list endpoint; same TTL as the configs
+_summary_cache: Tuple[float, Optional[List[Dict]]] = (0.0, None)
+# Handlers run in the threadpool; only one of them rebuilds the summaries at a time
+_summary_lock = threading.Lock()
+
+
+def _clear_config_cache():
+    """Drop all cached configurations and summaries (called after every write)."""
+    global _summary_cache
+    with _config_lock:
+        _config_cache.clear()
+    _summary_cache = (0.0, None)
+
+
+def _load_config(config_name: str) -> Optional[ValidationConfig]:
+    """
+    Load a validation configuration by name.
+    
+    Found configurations are cached for CONFIG_CACHE_TTL seconds; misses are
+    not cached, so a config created by another worker is visible right away.
+    
+    Args:
+        config_name: Name of the configuration
+    
+    Returns:
+        ValidationConfig, or None if it does not exist
+    """
+    now = time.monotonic()
+    with _config_lock:
+        cached = _config_cache.get(config_name)
+        if cached is not None and now < cached[0]:
+            _config_cache.move_to_end(config_name)
+            return cached[1]
+    
+    db = SessionLocal()
+    try:
+        row = db.get(ValidationConfigModel, config_name)
+    finally:
+        db.close()
+    
+    if row is None:
+        with _config_lock:
+            _config_cache.pop(config_name, None)
+        return None
+    
+    config = ValidationConfig.model_validate(row.payload)
+    with _config_lock:
+        _config_cache[config_name] = (now + CONFIG_CACHE_TTL, config)
+        _config_cache.move_to_end(config_name)
+        if len(_config_cache) > CONFIG_CACHE_SIZE:
+            _config_cache.popitem(last=False)
+    return config
 
 
 @router.post("/config/validation-rules", tags=["Configuration"])
-async def create_validation_config(config: ValidationConfig) -> Dict:
+def create_validation_config(config: ValidationConfig, db: Session = Depends(get_db)) -> Dict:
     """
     Create a new validation configuration with custom rules.
     
@@ -62,7 +124,9 @@ async def create_validation_config(config: ValidationConfig) -> Dict:
         ]
     }
     """
-    validation_configs[config.config_name] = config
+    db.merge(ValidationConfigModel(config_name=config.config_name, payload=config.model_dump()))
+    db.commit()
+    _clear_config_cache()
     
     return {
         "message": f"Validation configuration '{config.config_name}' created successfully",
@@ -72,42 +136,55 @@ async def create_validation_config(config: ValidationConfig) -> Dict:
 
 
 @router.get("/config/validation-rules", tags=["Configuration"])
-async def list_validation_configs() -> Dict:
+def list_validation_configs(db: Session = Depends(get_db)) -> Dict:
     """
     List all available validation configurations.
+    
+    The summary list is built once and reused until a write or
+    CONFIG_CACHE_TTL seconds pass.
     """
-    return {
-        "configs": [
-            {
-                "config_name": name,
-                "rules_count": len(config.rules),
-                "description": config.description
-            }
-            for name, config in validation_configs.items()
-        ]
-    }
+    global _summary_cache
+    with _summary_lock:
+        expires_at, summaries = _summary_cache
+        if summaries is None or time.monotonic() >= expires_at:
+            rows = db.query(ValidationConfigModel).order_by(ValidationConfigModel.config_name).all()
+            summaries = [
+                {
+                    "config_name": row.config_name,
+                    "rules_count": len(row.payload.get("rules", [])),
+                    "description": row.payload.get("description")
+                }
+                for row in rows
+            ]
+            _summary_cache = (time.monotonic() + CONFIG_CACHE_TTL, summaries)
+    
+    return {"configs": summaries}
 
 
 @router.get("/config/validation-rules/{config_name}", tags=["Configuration"])
-async def get_validation_config(config_name: str) -> ValidationConfig:
+def get_validation_config(config_name: str) -> ValidationConfig:
     """
     Get a specific validation configuration.
     """
-    if config_name not in validation_configs:
+    config = _load_config(config_name)
+    if config is None:
         raise HTTPException(status_code=404, detail=f"Configuration '{config_name}' not found")
     
-    return validation_configs[config_name]
+    return config
 
 
 @router.put("/config/validation-rules/{config_name}", tags=["Configuration"])
-async def update_validation_config(config_name: str, config: ValidationConfig) -> Dict:
+def update_validation_config(config_name: str, config: ValidationConfig, db: Session = Depends(get_db)) -> Dict:
     """
     Update an existing validation configuration.
     """
-    if config_name not in validation_configs:
+    row = db.get(ValidationConfigModel, config_name)
+    if row is None:
         raise HTTPException(status_code=404, detail=f"Configuration '{config_name}' not found")
     
-    validation_configs[config_name] = config
+    row.payload = config.model_dump()
+    db.commit()
+    _clear_config_cache()
     
     return {
         "message": f"Validation configuration '{config_name}' updated successfully",
@@ -116,16 +193,18 @@ async def update_validation_config(config_name: str, config: ValidationConfig) -
 
 
 @router.delete("/config/validation-rules/{config_name}", tags=["Configuration"])
-async def delete_validation_config(config_name: str) -> Dict:
+def delete_validation_config(config_name: str, db: Session = Depends(get_db)) -> Dict:
     """
     Delete a validation configuration.
     """
-    if config_name not in validation_configs:
+    row = db.get(ValidationConfigModel, config_name)
+    if row is None:
         raise HTTPException(status_code=404, detail=f"Configuration '{config_name}' not found")
     
-    del validation_configs[config_name]
+    db.delete(row)
+    db.commit()
+    _clear_config_cache()
     
     return {
         "message": f"Validation configuration '{config_name}' deleted successfully"
     }
-
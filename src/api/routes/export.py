@@ -2,35 +2,138 @@
 Extended export endpoints for various data formats.
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from pathlib import Path
-from typing import Literal, Optional
+from typing import Literal, Optional, Iterator, List
+from datetime import datetime
+import itertools
+import logging
+from src.api.deps import get_db
 from src.db.database import SessionLocal
 from src.db.models import CheckSession, Issue
 from src.core.export_formats import (
-    export_to_csv,
-    export_to_json,
-    export_to_xml,
-    export_to_parquet,
-    export_validation_results
+    stream_csv,
+    stream_json,
+    stream_xml,
+    stream_parquet
 )
-import pandas as pd
-import tempfile
 
 router = APIRouter()
 
+logger = logging.getLogger("api")
 
-def get_db():
+# Rows fetched from the database (and encoded) per chunk
+EXPORT_BATCH_SIZE = 1000
+
+FILE_EXTENSIONS = {
+    "csv": ".csv",
+    "json": ".json",
+    "xml": ".xml",
+    "parquet": ".parquet"
+}
+
+ISSUE_COLUMNS = [
+    Issue.row_number,
+    Issue.column_name,
+    Issue.issue_type,
+    Issue.description,
+    Issue.severity,
+    Issue.detected_at
+]
+
+SESSION_COLUMNS = [
+    CheckSession.id,
+    CheckSession.filename,
+    CheckSession.file_format,
+    CheckSession.rows,
+    CheckSession.issues_found,
+    CheckSession.created_at
+]
+
+
+def _iter_batches(stmt, iso_datetimes: bool = True) -> Iterator[List[tuple]]:
+    """
+    Run a query with a server-side cursor and yield its rows in batches.
+    
+    Uses its own session, since the response body is produced after the
+    request's dependencies have been cleaned up. Datetimes are converted to
+    ISO strings unless iso_datetimes is False.
+    """
     db = SessionLocal()
     try:
-        yield db
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            if not iso_datetimes:
+                yield [tuple(row) for row in partition]
+                continue
+            yield [
+                tuple(v.isoformat() if isinstance(v, datetime) else v for v in row)
+                for row in partition
+            ]
     finally:
         db.close()
 
 
+def _log_stream_errors(body: Iterator[bytes], filename: str) -> Iterator[bytes]:
+    """Pass chunks through, logging an error that aborts the download midway."""
+    try:
+        yield from body
+    except Exception as e:
+        logger.error(f"Export of '{filename}' failed while streaming: {e}")
+        raise
+
+
+def _close_batches(batches: Iterator[List[tuple]]):
+    """Close the batch generator, releasing its session if the download was aborted."""
+    try:
+        batches.close()
+    except ValueError:
+        # Still running in the threadpool; the session is closed when the generator is collected
+        pass
+
+
+def _stream_export(format: str, columns, stmt, filename: str, xml_tags) -> StreamingResponse:
+    """Build a streaming download of the query results in the given format."""
+    names = [col.key for col in columns]
+    # Parquet stores datetimes as native timestamp columns
+    rows = _iter_batches(stmt, iso_datetimes=format != "parquet")
+    batches = rows
+    
+    # Run the query and fetch the first batch before the response starts, so
+    # database errors still produce a 500 instead of a truncated download
+    try:
+        first_batch = next(batches, None)
+    except Exception as e:
+        logger.error(f"Export of '{filename}' failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    if first_batch is not None:
+        batches = itertools.chain([first_batch], batches)
+    
+    if format == "csv":
+        body = stream_csv(names, batches)
+    elif format == "json":
+        body = stream_json(names, batches)
+    elif format == "xml":
+        body = stream_xml(names, batches, *xml_tags)
+    else:
+        fields = [
+            (name, col.type.python_type if col.type.python_type in (int, datetime) else str)
+            for name, col in zip(names, columns)
+        ]
+        body = stream_parquet(fields, batches)
+    
+    return StreamingResponse(
+        _log_stream_errors(body, filename),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        background=BackgroundTask(_close_batches, rows)
+    )
+
+
 @router.get("/export/session/{session_id}", tags=["Export"])
-async def export_session_data(
+def export_session_data(
     session_id: int,
     format: Literal["csv", "json", "xml", "parquet"] = Query("json", description="Export format"),
     db: Session = Depends(get_db)
@@ -39,68 +142,27 @@ async def export_session_data(
     Export session data in various formats.
     
     Exports all issues from a specific session in the requested format.
+    The file is streamed in batches as it is read from the database.
     """
-    session = db.query(CheckSession).filter(CheckSession.id == session_id).first()
+    session = db.query(CheckSession.id).filter(CheckSession.id == session_id).first()
     
     if not session:
         raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
     
-    # Get issues for this session
-    issues = db.query(Issue).filter(Issue.session_id == session_id).all()
-    
     # Allow export even if no issues found (return empty data)
-    if not issues:
-        issues = []
-    
-    # Convert to list of dicts
-    issues_data = [
-        {
-            "row_number": issue.row_number,
-            "column_name": issue.column_name,
-            "issue_type": issue.issue_type,
-            "description": issue.description,
-            "severity": issue.severity,
-            "detected_at": issue.detected_at.isoformat() if issue.detected_at else None
-        }
-        for issue in issues
-    ]
-    
-    # Create temporary file
-    file_ext = {
-        "csv": ".csv",
-        "json": ".json",
-        "xml": ".xml",
-        "parquet": ".parquet"
-    }[format]
-    
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-    temp_path = Path(temp_file.name)
-    temp_file.close()
-    
-    try:
-        if format == "json":
-            export_validation_results(issues_data, temp_path, format="json")
-        elif format == "csv":
-            export_validation_results(issues_data, temp_path, format="csv")
-        elif format == "xml":
-            export_validation_results(issues_data, temp_path, format="xml")
-        elif format == "parquet":
-            df = pd.DataFrame(issues_data)
-            export_to_parquet(df, temp_path)
-        
-        return FileResponse(
-            path=str(temp_path),
-            filename=f"session_{session_id}_issues{file_ext}",
-            media_type="application/octet-stream"
-        )
-    except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+    stmt = select(*ISSUE_COLUMNS).where(Issue.session_id == session_id).order_by(Issue.id)
+    
+    return _stream_export(
+        format,
+        ISSUE_COLUMNS,
+        stmt,
+        f"session_{session_id}_issues{FILE_EXTENSIONS[format]}",
+        ("validation_issues", "issue")
+    )
 
 
 @router.get("/export/history", tags=["Export"])
-async def export_history(
+def export_history(
     format: Literal["csv", "json", "xml", "parquet"] = Query("json", description="Export format"),
     limit: Optional[int] = Query(None, ge=1, le=10000, description="Maximum number of sessions to export"),
     db: Session = Depends(get_db)
@@ -109,61 +171,19 @@ async def export_history(
     Export check history in various formats.
     
     Exports all check sessions with their summary information.
+    The file is streamed in batches as it is read from the database.
     """
-    query = db.query(CheckSession)
-    
-    sessions = query.order_by(CheckSession.created_at.desc()).all()
-    
-    if limit:
-        sessions = sessions[:limit]
-    
-    if not sessions:
+    if db.query(CheckSession.id).first() is None:
         raise HTTPException(status_code=404, detail="No sessions found")
     
-    # Convert to list of dicts
-    sessions_data = [
-        {
-            "id": session.id,
-            "filename": session.filename,
-            "file_format": session.file_format,
-            "rows": session.rows,
-            "issues_found": session.issues_found,
-            "created_at": session.created_at.isoformat() if session.created_at else None
-        }
-        for session in sessions
-    ]
-    
-    # Create temporary file
-    file_ext = {
-        "csv": ".csv",
-        "json": ".json",
-        "xml": ".xml",
-        "parquet": ".parquet"
-    }[format]
-    
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_ext)
-    temp_path = Path(temp_file.name)
-    temp_file.close()
-    
-    try:
-        df = pd.DataFrame(sessions_data)
-        
-        if format == "csv":
-            export_to_csv(df, temp_path)
-        elif format == "json":
-            export_to_json(df, temp_path)
-        elif format == "xml":
-            export_to_xml(df, temp_path)
-        elif format == "parquet":
-            export_to_parquet(df, temp_path)
-        
-        return FileResponse(
-            path=str(temp_path),
-            filename=f"check_history{file_ext}",
-            media_type="application/octet-stream"
-        )
-    except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
-        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
-
+    stmt = select(*SESSION_COLUMNS).order_by(CheckSession.created_at.desc())
+    if limit:
+        stmt = stmt.limit(limit)
+    
+    return _stream_export(
+        format,
+        SESSION_COLUMNS,
+        stmt,
+        f"check_history{FILE_EXTENSIONS[format]}",
+        ("data", "row")
+    )
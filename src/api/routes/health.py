@@ -1,30 +1,57 @@
 """
 Health check and monitoring endpoints.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional, Tuple
+import orjson
 import psutil
 import os
+import time
 from pathlib import Path
 
 router = APIRouter()
 
+# Seconds the basic health response body is reused
+HEALTH_TTL = 1.0
+
+# (expires_at, serialized body) of the last basic health response
+_health_cache: Tuple[float, bytes] = (0.0, b"")
+
+# Seconds a detailed health result is reused (absorbs load balancer polling)
+DETAILED_HEALTH_TTL = 2.0
+
+# (expires_at, result) of the last detailed health check
+_detailed_cache: Tuple[float, Optional[Dict]] = (0.0, None)
+
+# Prime the CPU counter so later non-blocking calls return a real value
+psutil.cpu_percent(interval=None)
+
 
 @router.get("/health")
-async def health_check() -> Dict:
+async def health_check() -> Response:
     """
     Health check endpoint for monitoring and load balancers.
     
+    The serialized body is rebuilt at most once per HEALTH_TTL seconds, so
+    frequent probes only send pre-built bytes.
+    
     Returns:
         Health status with timestamp and basic system info
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "Data Quality Checker API",
-        "version": "1.0.0"
-    }
+    global _health_cache
+    now = time.monotonic()
+    expires_at, body = _health_cache
+    if now >= expires_at:
+        body = orjson.dumps({
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "service": "Data Quality Checker API",
+            "version": "1.0.0"
+        })
+        _health_cache = (now + HEALTH_TTL, body)
+    
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/health/detailed")
@@ -32,12 +59,27 @@ async def detailed_health_check() -> Dict:
     """
     Detailed health check with system metrics.
     
+    Results are cached for DETAILED_HEALTH_TTL seconds.
+    
     Returns:
         Detailed health status with system resources
     """
+    global _detailed_cache
+    now = time.monotonic()
+    expires_at, cached = _detailed_cache
+    if cached is not None and now < expires_at:
+        return cached
+    
+    result = _collect_detailed_health()
+    _detailed_cache = (now + DETAILED_HEALTH_TTL, result)
+    return result
+
+
+def _collect_detailed_health() -> Dict:
+    """Gather system and component status for the detailed health check."""
     try:
-        # Get system info
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # Get system info (CPU usage since the previous call, doesn't block)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from src.db.database import SessionLocal
-from src.db.models import CheckSession, Issue
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.orm import Session, selectinload, undefer
+from sqlalchemy import func, or_, and_
+from src.api.deps import get_db
+from src.db.models import CheckSession
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List, Optional, Dict
 from datetime import datetime
 
@@ -11,15 +11,6 @@ from datetime import datetime
 router = APIRouter()
 
 
-# Dependency that provides a database session for each request
-def get_db():
-    db = SessionLocal()  # Create new DB connection
-    try:
-        yield db  # Provide the session to the route
-    finally:
-        db.close()  # Ensure it's closed after response is returned
-
-
 class IssueOut(BaseModel):
     row_number: Optional[int]
     column_name: Optional[str]
@@ -27,62 +18,120 @@ class IssueOut(BaseModel):
     description: Optional[str]
     severity: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-# Pydantic response schema for a check session (used to serialize ORM output) with nested issues
-class CheckSessionOut(BaseModel):
+# Pydantic response schema for a check session (used to serialize ORM output)
+class CheckSessionSummaryOut(BaseModel):
     id: int
     filename: str
     file_format: str
     rows: int
     issues_found: int
     created_at: datetime
+    issue_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)  # Tells Pydantic to work with SQLAlchemy models
+
+
+# Check session with its nested issues
+class CheckSessionOut(CheckSessionSummaryOut):
     issues: Optional[List[IssueOut]] = []
 
-    class Config:
-        from_attributes = True  # Tells Pydantic to work with SQLAlchemy models (Pydantic v2)
+
+# Built once; validate and serialize a whole page in a single pydantic-core call
+_SUMMARIES_ADAPTER = TypeAdapter(List[CheckSessionSummaryOut])
+_SESSIONS_ADAPTER = TypeAdapter(List[CheckSessionOut])
+
+
+def _encode_cursor(session: CheckSession) -> str:
+    """Build the keyset cursor pointing just after the given session."""
+    created_at = session.created_at.isoformat() if session.created_at else ""
+    return f"{created_at}_{session.id}"
+
+
+def _decode_cursor(cursor: str):
+    """Parse a cursor produced by _encode_cursor into (created_at or None, id)."""
+    try:
+        created_at, session_id = cursor.rsplit("_", 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: '{cursor}'")
 
 
 # GET endpoint that returns all check sessions from the database with pagination
 @router.get("/checks/history", response_model=dict)
 def get_check_sessions(
-        with_issues: bool = Query(False, description="Include issues in response"),
+        with_issues: bool = Query(False, description="Include issues in response (alias of 'full')"),
+        full: bool = Query(False, description="Include full issue rows; otherwise only 'issue_count' is returned"),
         page: int = Query(1, ge=1, description="Page number (starts from 1)"),
         page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+        cursor: Optional[str] = Query(None, description="Cursor from a previous page's 'next_cursor' (keyset pagination, ignores 'page')"),
         db: Session = Depends(get_db)
 ):
     """
     Returns a paginated list of check session records in descending order of creation time.
-    """
-    # Calculate offset
-    offset = (page - 1) * page_size
     
+    Pages can be requested by number (OFFSET) or, for deep pages, with the
+    'next_cursor' of the previous page, which seeks directly on the
+    (created_at, id) index instead of scanning the skipped rows. Cursor pages
+    have no page number, so their pagination block omits 'page' and
+    'has_previous'.
+    
+    Each session carries its 'issue_count'; the issue rows themselves are
+    only loaded, and included, with full=true (or with_issues=true).
+    """
     # Get total count
     total_count = db.query(func.count(CheckSession.id)).scalar()
     
-    # Get paginated results
-    query = db.query(CheckSession)
-    if with_issues:
-        query = query.options(joinedload(CheckSession.issues))
+    # Get paginated results (sessions without a timestamp come last)
+    query = db.query(CheckSession).order_by(
+        CheckSession.created_at.desc().nulls_last(),
+        CheckSession.id.desc()
+    )
+    include_issues = with_issues or full
+    query = query.options(undefer(CheckSession.issue_count))
+    if include_issues:
+        # One extra "WHERE session_id IN (...)" query instead of a row-multiplying JOIN
+        query = query.options(selectinload(CheckSession.issues))
+    
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        if cursor_created_at is None:
+            query = query.filter(CheckSession.created_at.is_(None), CheckSession.id < cursor_id)
+        else:
+            query = query.filter(or_(
+                CheckSession.created_at < cursor_created_at,
+                and_(CheckSession.created_at == cursor_created_at, CheckSession.id < cursor_id),
+                CheckSession.created_at.is_(None)
+            ))
+    else:
+        query = query.offset((page - 1) * page_size)
     
-    sessions = query.order_by(CheckSession.created_at.desc()).offset(offset).limit(page_size).all()
+    # One extra row tells whether another page follows
+    sessions = query.limit(page_size + 1).all()
+    has_more = len(sessions) > page_size
+    sessions = sessions[:page_size]
     
     # Calculate pagination metadata
     total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 0
     
     # Serialize sessions using Pydantic models
-    items = [CheckSessionOut.model_validate(session) for session in sessions]
+    adapter = _SESSIONS_ADAPTER if include_issues else _SUMMARIES_ADAPTER
+    items = adapter.dump_python(adapter.validate_python(sessions, from_attributes=True))
+    
+    pagination = {
+        "page_size": page_size,
+        "total_items": total_count,
+        "total_pages": total_pages,
+        "has_next": has_more,
+        "next_cursor": _encode_cursor(sessions[-1]) if has_more else None
+    }
+    if cursor is None:
+        pagination["page"] = page
+        pagination["has_previous"] = page > 1
     
     return {
-        "items": [item.model_dump() for item in items],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total_items": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_previous": page > 1
-        }
+        "items": items,
+        "pagination": pagination
     }
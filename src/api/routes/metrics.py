@@ -3,25 +3,24 @@ API metrics and usage statistics endpoints.
 """
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.db.database import SessionLocal
+from sqlalchemy import func, select, literal, cast, String, union_all
+from src.api.deps import get_db
 from src.db.models import CheckSession, Issue
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+import time
 
 router = APIRouter()
 
+# Seconds a metrics summary is reused before the aggregates are recomputed
+SUMMARY_TTL = 10.0
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# (expires_at, result) of the last metrics summary
+_summary_cache: Tuple[float, Optional[Dict]] = (0.0, None)
 
 
 @router.get("/metrics/usage")
-async def get_usage_metrics(
+def get_usage_metrics(
     days: int = 7,
     db: Session = Depends(get_db)
 ) -> Dict:
@@ -40,46 +39,42 @@ async def get_usage_metrics(
     """
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    # Get total checks in period
-    total_checks = db.query(func.count(CheckSession.id))\
-        .filter(CheckSession.created_at >= cutoff_date)\
-        .scalar() or 0
+    # All period statistics in one round-trip: one UNION ALL of the per-day,
+    # per-format and issue counts (total checks is the sum of the per-day counts)
+    in_period = CheckSession.created_at >= cutoff_date
+    day = cast(func.date(CheckSession.created_at), String)
+    stmt = union_all(
+        select(literal("day"), day, func.count(CheckSession.id))
+            .where(in_period)
+            .group_by(day),
+        select(literal("format"), CheckSession.file_format, func.count(CheckSession.id))
+            .where(in_period)
+            .group_by(CheckSession.file_format),
+        select(literal("issues"), literal(None, String), func.count(Issue.id))
+            .join(CheckSession, Issue.session_id == CheckSession.id)
+            .where(in_period)
+    )
+    
+    checks_by_day = []
+    checks_by_format_dict = {}
+    total_issues = 0
+    for kind, key, count in db.execute(stmt):
+        if kind == "day":
+            checks_by_day.append((key, count))
+        elif kind == "format":
+            checks_by_format_dict[key] = count
+        else:
+            total_issues = count or 0
+    
+    # Newest day first
+    checks_by_day.sort(reverse=True)
+    checks_by_day_dict = {str(date): count for date, count in checks_by_day}
     
-    # Get total issues
-    total_issues = db.query(func.count(Issue.id))\
-        .join(CheckSession)\
-        .filter(CheckSession.created_at >= cutoff_date)\
-        .scalar() or 0
+    total_checks = sum(checks_by_day_dict.values())
     
     # Get average issues per check
     avg_issues = total_issues / total_checks if total_checks > 0 else 0
     
-    # Get checks by day
-    checks_by_day = db.query(
-        func.date(CheckSession.created_at).label('date'),
-        func.count(CheckSession.id).label('count')
-    ).filter(
-        CheckSession.created_at >= cutoff_date
-    ).group_by(
-        func.date(CheckSession.created_at)
-    ).order_by(
-        func.date(CheckSession.created_at).desc()
-    ).all()
-    
-    checks_by_day_dict = {str(date): count for date, count in checks_by_day}
-    
-    # Get checks by file format
-    checks_by_format = db.query(
-        CheckSession.file_format,
-        func.count(CheckSession.id).label('count')
-    ).filter(
-        CheckSession.created_at >= cutoff_date
-    ).group_by(
-        CheckSession.file_format
-    ).all()
-    
-    checks_by_format_dict = {format: count for format, count in checks_by_format}
-    
     return {
         "period_days": days,
         "period_start": cutoff_date.isoformat(),
@@ -95,15 +90,23 @@ async def get_usage_metrics(
 
 
 @router.get("/metrics/summary")
-async def get_metrics_summary(
+def get_metrics_summary(
     db: Session = Depends(get_db)
 ) -> Dict:
     """
     Get overall API metrics summary.
     
+    Results are cached for SUMMARY_TTL seconds.
+    
     Returns:
         Overall statistics since API start
     """
+    global _summary_cache
+    now = time.monotonic()
+    expires_at, cached = _summary_cache
+    if cached is not None and now < expires_at:
+        return cached
+    
     # Total checks
     total_checks = db.query(func.count(CheckSession.id)).scalar() or 0
     
@@ -127,7 +130,7 @@ async def get_metrics_summary(
     
     severity_stats = {severity: count for severity, count in issues_by_severity}
     
-    return {
+    result = {
         "total_checks": total_checks,
         "total_issues": total_issues,
         "average_issues_per_check": round(avg_issues, 2),
@@ -135,4 +138,6 @@ async def get_metrics_summary(
         "last_check": last_check.isoformat() if last_check else None,
         "issues_by_severity": severity_stats
     }
+    _summary_cache = (now + SUMMARY_TTL, result)
+    return result
 
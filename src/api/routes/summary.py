@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from src.db.database import SessionLocal
+from src.api.deps import get_db
+from src.api.responses import ORJSONResponse
 from src.db.models import CheckSummaryView
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import List
 from datetime import datetime
 
@@ -10,15 +11,6 @@ from datetime import datetime
 router = APIRouter()
 
 
-# Dependency that provides a new database session for each request
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db  # yield the session to the route
-    finally:
-        db.close()  # close session after response
-
-
 # Pydantic response schema for a single row in check_summary_view
 class CheckSummaryOut(BaseModel):
     session_id: int
@@ -28,8 +20,11 @@ class CheckSummaryOut(BaseModel):
     issue_count: int
     high_severity_issues: int
 
-    class Config:
-        orm_mode = True  # allows compatibility with SQLAlchemy ORM objects
+    model_config = ConfigDict(from_attributes=True)  # allows compatibility with SQLAlchemy ORM objects
+
+
+# Built once; validates and serializes all rows in a single pydantic-core call
+_SUMMARY_ADAPTER = TypeAdapter(List[CheckSummaryOut])
 
 
 # GET endpoint to fetch all summarized check sessions
@@ -39,4 +34,10 @@ def get_check_summary(db: Session = Depends(get_db)):
     Returns summarized data from the check_summary_view.
     Each record includes aggregated issue stats for a session.
     """
-    return db.query(CheckSummaryView).order_by(CheckSummaryView.created_at.desc()).all()
+    rows = db.query(CheckSummaryView).order_by(CheckSummaryView.created_at.desc()).all()
+    # Returning the response directly skips FastAPI's second validation pass
+    # against response_model, which is kept for the OpenAPI schema
+    return ORJSONResponse(content=_SUMMARY_ADAPTER.dump_python(
+        _SUMMARY_ADAPTER.validate_python(rows, from_attributes=True),
+        mode="json"
+    ))
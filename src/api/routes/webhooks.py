@@ -3,14 +3,53 @@ Webhook endpoints for notifications.
 """
 from fastapi import APIRouter, Body, HTTPException
 from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional, List, Dict
-import httpx
+from typing import Optional, List, Dict, FrozenSet, Mapping, NamedTuple, Set, Tuple
 import asyncio
+import hmac
+import logging
+import os
+import random
+import threading
+import time
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from types import MappingProxyType
+
+import httpx
+import orjson
+
+from src.core.http_client import get_http_client
 
 router = APIRouter()
 
+logger = logging.getLogger("api")
+
+# Pending webhook events; when full, new events are dropped instead of piling up
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+
+# Number of background tasks delivering queued events
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "8"))
+
+# Timeout for a single webhook POST (seconds)
+WEBHOOK_DELIVERY_TIMEOUT = float(os.getenv("WEBHOOK_DELIVERY_TIMEOUT", "5"))
+
+# Attempts per delivery, with exponential backoff (plus random jitter) between them
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "3"))
+WEBHOOK_RETRY_BACKOFF = float(os.getenv("WEBHOOK_RETRY_BACKOFF", "0.5"))
+WEBHOOK_RETRY_JITTER = float(os.getenv("WEBHOOK_RETRY_JITTER", "0.5"))
+
+# Circuit breaker: after this many failed deliveries in a row a webhook is
+# skipped for WEBHOOK_BREAKER_COOLDOWN seconds, then one trial delivery is let through
+WEBHOOK_BREAKER_THRESHOLD = int(os.getenv("WEBHOOK_BREAKER_THRESHOLD", "5"))
+WEBHOOK_BREAKER_COOLDOWN = float(os.getenv("WEBHOOK_BREAKER_COOLDOWN", "60"))
+
+# Maximum concurrent deliveries when fanning one event out to its webhooks
+WEBHOOK_FANOUT_CONCURRENCY = int(os.getenv("WEBHOOK_FANOUT_CONCURRENCY", "50"))
+
+# How long shutdown waits for queued events to be delivered (seconds)
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "10"))
+
 
 class WebhookEvent(str, Enum):
     """Webhook event types."""
@@ -25,10 +64,96 @@ class WebhookConfig(BaseModel):
     events: List[WebhookEvent] = Field(..., description="List of events to subscribe to")
     secret: Optional[str] = Field(None, description="Optional secret for webhook signature")
     enabled: bool = Field(True, description="Whether the webhook is enabled")
+    
+    @cached_property
+    def secret_bytes(self) -> Optional[bytes]:
+        """Signing key, encoded once per configuration rather than per delivery."""
+        return self.secret.encode() if self.secret else None
+    
+    @cached_property
+    def url_str(self) -> str:
+        """Target URL as a string, converted once rather than per delivery."""
+        return str(self.url)
+    
+    @cached_property
+    def events_set(self) -> FrozenSet[WebhookEvent]:
+        """Subscribed events as a set for O(1) membership checks."""
+        return frozenset(self.events)
+
+
+class _WebhookState(NamedTuple):
+    """Read-only snapshot of the configured webhooks and their event index."""
+    webhooks: Mapping[str, WebhookConfig]
+    # event -> ids of the webhooks subscribed to it
+    subscribers: Mapping[WebhookEvent, FrozenSet[str]]
+
+
+# In-memory storage for webhooks (use database in production). Copy-on-write:
+# readers take `_state` once and use it without locking; writers build a new
+# snapshot under `_state_lock` and rebind it in one assignment
+_state = _WebhookState(MappingProxyType({}), MappingProxyType({}))
+_state_lock = threading.Lock()
+
+# webhook_id -> (consecutive failed deliveries, skipped until); absent means healthy
+_breakers: Dict[str, Tuple[int, float]] = {}
+
+
+def _build_state(webhook_map: Dict[str, WebhookConfig]) -> _WebhookState:
+    """Freeze a webhook mapping into a snapshot with its event index."""
+    index: Dict[WebhookEvent, Set[str]] = {}
+    for webhook_id, config in webhook_map.items():
+        for event in config.events_set:
+            index.setdefault(event, set()).add(webhook_id)
+    return _WebhookState(
+        MappingProxyType(webhook_map),
+        MappingProxyType({event: frozenset(ids) for event, ids in index.items()})
+    )
 
 
-# In-memory storage for webhooks (use database in production)
-webhooks: Dict[str, WebhookConfig] = {}
+def _save_webhook(webhook_id: str, config: WebhookConfig):
+    """Store (or replace) a webhook and index its event subscriptions."""
+    global _state
+    with _state_lock:
+        _state = _build_state({**_state.webhooks, webhook_id: config})
+        _breakers.pop(webhook_id, None)
+
+
+def _remove_webhook(webhook_id: str):
+    """Remove a webhook, its subscriptions and its circuit breaker state."""
+    global _state
+    with _state_lock:
+        remaining = dict(_state.webhooks)
+        if remaining.pop(webhook_id, None) is not None:
+            _state = _build_state(remaining)
+        _breakers.pop(webhook_id, None)
+
+
+def _clear_webhooks():
+    """Remove all webhooks and circuit breaker state."""
+    global _state
+    with _state_lock:
+        _state = _build_state({})
+        _breakers.clear()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Timeouts, connection errors and 5xx responses are worth retrying; 4xx are not."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return True
+
+
+def _record_failure(webhook_id: str):
+    """Count a failed delivery, opening the breaker at the threshold."""
+    failures = _breakers.get(webhook_id, (0, 0.0))[0] + 1
+    open_until = 0.0
+    if failures >= WEBHOOK_BREAKER_THRESHOLD:
+        open_until = time.monotonic() + WEBHOOK_BREAKER_COOLDOWN
+        logger.warning(
+            f"Webhook {webhook_id} failed {failures} times in a row, "
+            f"pausing deliveries for {WEBHOOK_BREAKER_COOLDOWN}s"
+        )
+    _breakers[webhook_id] = (failures, open_until)
 
 
 async def send_webhook(webhook_id: str, event: WebhookEvent, data: Dict):
@@ -40,53 +165,191 @@ async def send_webhook(webhook_id: str, event: WebhookEvent, data: Dict):
         event: Event type
         data: Event data payload
     """
-    if webhook_id not in webhooks:
+    webhook = _state.webhooks.get(webhook_id)
+    if webhook is None:
         return
     
-    webhook = webhooks[webhook_id]
-    
     if not webhook.enabled:
         return
     
-    if event not in webhook.events:
+    if event not in webhook.events_set:
         return
     
-    try:
-        payload = {
+    # Serialized once; the signature covers exactly the bytes that are sent
+    payload_bytes = orjson.dumps(
+        {
             "event": event.value,
             "timestamp": datetime.utcnow().isoformat(),
             "data": data
-        }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "Data-Quality-Checker-API/1.0.0"
-        }
-        
-        # Add signature if secret is configured
-        if webhook.secret:
-            import hmac
-            import hashlib
-            import json
-            payload_str = json.dumps(payload, sort_keys=True)
-            signature = hmac.new(
-                webhook.secret.encode(),
-                payload_str.encode(),
-                hashlib.sha256
-            ).hexdigest()
-            headers["X-Webhook-Signature"] = f"sha256={signature}"
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        },
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+    
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "Data-Quality-Checker-API/1.0.0"
+    }
+    
+    # Add signature if secret is configured
+    if webhook.secret_bytes:
+        # One-shot HMAC in C (OpenSSL), without building an hmac.HMAC object
+        signature = hmac.digest(webhook.secret_bytes, payload_bytes, "sha256").hex()
+        headers["X-Webhook-Signature"] = f"sha256={signature}"
+    
+    # Circuit open: skip until the cool-down ends. The next delivery after it
+    # is the trial; pushing the deadline out keeps concurrent ones from piling on
+    failures, open_until = _breakers.get(webhook_id, (0, 0.0))
+    if failures >= WEBHOOK_BREAKER_THRESHOLD:
+        now = time.monotonic()
+        if now < open_until:
+            return
+        _breakers[webhook_id] = (failures, now + WEBHOOK_BREAKER_COOLDOWN)
+    
+    for attempt in range(1, WEBHOOK_MAX_ATTEMPTS + 1):
+        try:
+            client = get_http_client()
             response = await client.post(
-                str(webhook.url),
-                json=payload,
-                headers=headers
+                webhook.url_str,
+                content=payload_bytes,
+                headers=headers,
+                timeout=WEBHOOK_DELIVERY_TIMEOUT
             )
             response.raise_for_status()
-            
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Webhook delivery failed for {webhook_id}: {e}")
+            _breakers.pop(webhook_id, None)
+            return
+        except Exception as e:
+            if attempt == WEBHOOK_MAX_ATTEMPTS or not _is_retryable(e):
+                # Log error but don't fail the request
+                logger.warning(f"Webhook delivery failed for {webhook_id} after {attempt} attempts: {e}")
+                _record_failure(webhook_id)
+                return
+            delay = WEBHOOK_RETRY_BACKOFF * 2 ** (attempt - 1) + random.uniform(0, WEBHOOK_RETRY_JITTER)
+            await asyncio.sleep(delay)
+
+
+async def send_webhooks(event: WebhookEvent, data: Dict):
+    """
+    Send a webhook notification to all subscribed webhooks concurrently.
+    
+    Subscribers are looked up in the event index rather than by scanning
+    every webhook; at most WEBHOOK_FANOUT_CONCURRENCY deliveries run at once.
+    
+    Args:
+        event: Event type
+        data: Event data payload
+    """
+    state = _state
+    matches = [
+        webhook_id for webhook_id in state.subscribers.get(event, ())
+        if state.webhooks[webhook_id].enabled
+    ]
+    if not matches:
+        return
+    
+    semaphore = asyncio.Semaphore(WEBHOOK_FANOUT_CONCURRENCY)
+    
+    async def _send(webhook_id: str):
+        async with semaphore:
+            await send_webhook(webhook_id, event, data)
+    
+    await asyncio.gather(*(_send(webhook_id) for webhook_id in matches), return_exceptions=True)
+
+
+_event_queue: Optional["asyncio.Queue[Tuple[WebhookEvent, Dict]]"] = None
+_event_workers: List[asyncio.Task] = []
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+# One-off deliveries made while no workers are running; referenced so they aren't GC'd
+_fallback_deliveries: Set[asyncio.Task] = set()
+
+
+async def _deliver_events(queue: "asyncio.Queue[Tuple[WebhookEvent, Dict]]"):
+    """Worker: send queued events to their webhooks until cancelled."""
+    while True:
+        try:
+            event, data = await queue.get()
+        except asyncio.CancelledError:
+            return
+        try:
+            await send_webhooks(event, data)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.warning(f"Webhook delivery for '{event.value}' failed: {e}")
+        finally:
+            queue.task_done()
+
+
+def start_webhook_workers():
+    """
+    Create the event queue and its delivery workers on the running event loop.
+    
+    Called once from the application lifespan; workers live as long as the app.
+    """
+    global _event_queue, _event_workers, _event_loop
+    if _event_queue is not None:
+        return
+    
+    _event_queue = asyncio.Queue(maxsize=WEBHOOK_QUEUE_SIZE)
+    _event_workers = [asyncio.create_task(_deliver_events(_event_queue)) for _ in range(WEBHOOK_WORKERS)]
+    _event_loop = asyncio.get_running_loop()
+
+
+async def stop_webhook_workers():
+    """
+    Drain the queue (up to WEBHOOK_DRAIN_TIMEOUT) and stop the delivery workers.
+    
+    Called from the application lifespan on shutdown.
+    """
+    global _event_queue, _event_workers, _event_loop
+    if _event_queue is None:
+        return
+    
+    queue, workers = _event_queue, _event_workers
+    # Stop accepting new events while draining
+    _event_queue, _event_workers, _event_loop = None, [], None
+    
+    if workers:
+        try:
+            await asyncio.wait_for(queue.join(), timeout=WEBHOOK_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {queue.qsize()} undelivered webhook events on shutdown")
+    
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
+def enqueue_webhooks(event: WebhookEvent, data: Dict) -> bool:
+    """
+    Queue an event for background delivery to all configured webhooks.
+    
+    Returns immediately; delivery happens on the worker tasks. When the
+    workers aren't running (app used without its lifespan), the event is
+    delivered by a one-off task on the current loop instead.
+    
+    Args:
+        event: Event type
+        data: Event data payload
+        
+    Returns:
+        True if queued, False if the queue is full and the event was dropped
+    """
+    if not _state.subscribers.get(event):
+        return True
+    
+    loop = asyncio.get_running_loop()
+    if _event_queue is None or _event_loop is not loop:
+        task = loop.create_task(send_webhooks(event, data))
+        _fallback_deliveries.add(task)
+        task.add_done_callback(_fallback_deliveries.discard)
+        return True
+    
+    try:
+        _event_queue.put_nowait((event, data))
+        return True
+    except asyncio.QueueFull:
+        logger.warning(f"Webhook queue full, dropping '{event.value}' event")
+        return False
 
 
 @router.post("/webhooks", tags=["Webhooks"])
@@ -110,7 +373,7 @@ async def create_webhook(
         raise HTTPException(status_code=400, detail="webhook_id is required")
     
     webhook_config = WebhookConfig(**{k: v for k, v in webhook_data.items() if k != "webhook_id"})
-    webhooks[webhook_id] = webhook_config
+    _save_webhook(webhook_id, webhook_config)
     
     return {
         "message": f"Webhook '{webhook_id}' created successfully",
@@ -133,7 +396,7 @@ async def list_webhooks() -> Dict:
                 "events": [e.value for e in config.events],
                 "enabled": config.enabled
             }
-            for webhook_id, config in webhooks.items()
+            for webhook_id, config in _state.webhooks.items()
         ]
     }
 
@@ -143,10 +406,11 @@ async def get_webhook(webhook_id: str) -> WebhookConfig:
     """
     Get a specific webhook configuration.
     """
-    if webhook_id not in webhooks:
+    webhook = _state.webhooks.get(webhook_id)
+    if webhook is None:
         raise HTTPException(status_code=404, detail=f"Webhook '{webhook_id}' not found")
     
-    return webhooks[webhook_id]
+    return webhook
 
 
 @router.put("/webhooks/{webhook_id}", tags=["Webhooks"])
@@ -154,11 +418,11 @@ async def update_webhook(webhook_id: str, webhook_data: Dict = Body(...)) -> Dic
     """
     Update an existing webhook configuration.
     """
-    if webhook_id not in webhooks:
+    if webhook_id not in _state.webhooks:
         raise HTTPException(status_code=404, detail=f"Webhook '{webhook_id}' not found")
     
     webhook_config = WebhookConfig(**webhook_data)
-    webhooks[webhook_id] = webhook_config
+    _save_webhook(webhook_id, webhook_config)
     
     return {
         "message": f"Webhook '{webhook_id}' updated successfully"
@@ -170,10 +434,10 @@ async def delete_webhook(webhook_id: str) -> Dict:
     """
     Delete a webhook configuration.
     """
-    if webhook_id not in webhooks:
+    if webhook_id not in _state.webhooks:
         raise HTTPException(status_code=404, detail=f"Webhook '{webhook_id}' not found")
     
-    del webhooks[webhook_id]
+    _remove_webhook(webhook_id)
     
     return {
         "message": f"Webhook '{webhook_id}' deleted successfully"
@@ -185,7 +449,7 @@ async def test_webhook(webhook_id: str) -> Dict:
     """
     Send a test webhook notification.
     """
-    if webhook_id not in webhooks:
+    if webhook_id not in _state.webhooks:
         raise HTTPException(status_code=404, detail=f"Webhook '{webhook_id}' not found")
     
     test_data = {
@@ -2,17 +2,57 @@
 Comparison utilities for comparing data quality checks over time.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import copy
+import threading
+import time
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from src.db.models import CheckSession, Issue
 from src.db.database import SessionLocal
 
+# Seconds recent-session and trend results are reused; new check sessions
+# clear the cache (see clear_comparison_cache)
+COMPARISON_CACHE_TTL = 30.0
+COMPARISON_CACHE_SIZE = 64
+
+# key -> (expires_at, result)
+_comparison_cache: Dict[tuple, Tuple[float, object]] = {}
+_comparison_cache_lock = threading.Lock()
+
+
+def clear_comparison_cache():
+    """Drop cached recent-session and trend results (called when sessions are added)."""
+    with _comparison_cache_lock:
+        _comparison_cache.clear()
+
+
+def _cache_get(key: tuple):
+    """Return the cached result for key, or None if missing or expired."""
+    with _comparison_cache_lock:
+        cached = _comparison_cache.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        _comparison_cache.pop(key, None)
+        return None
+
+
+def _cache_set(key: tuple, result):
+    """Cache a result for COMPARISON_CACHE_TTL seconds, evicting the oldest entry when full."""
+    with _comparison_cache_lock:
+        if key not in _comparison_cache and len(_comparison_cache) >= COMPARISON_CACHE_SIZE:
+            _comparison_cache.pop(next(iter(_comparison_cache)))
+        _comparison_cache[key] = (time.monotonic() + COMPARISON_CACHE_TTL, result)
+
 
 def get_recent_sessions(limit: int = 10, db_session: Session = None) -> List[CheckSession]:
     """
     Get recent check sessions ordered by creation date.
     
+    Without a db_session, results are cached for COMPARISON_CACHE_TTL
+    seconds (objects loaded into a caller's session are never shared).
+    
     Args:
         limit: Maximum number of sessions to return
         db_session: Optional database session
@@ -22,6 +62,9 @@ def get_recent_sessions(limit: int = 10, db_session: Session = None) -> List[Che
     """
     session_created = False
     if db_session is None:
+        cached = _cache_get(("recent", limit))
+        if cached is not None:
+            return list(cached)
         db_session = SessionLocal()
         session_created = True
     
@@ -30,6 +73,8 @@ def get_recent_sessions(limit: int = 10, db_session: Session = None) -> List[Che
             .order_by(CheckSession.created_at.desc())\
             .limit(limit)\
             .all()
+        if session_created:
+            _cache_set(("recent", limit), sessions)
         return sessions
     finally:
         if session_created:
@@ -54,26 +99,35 @@ def compare_sessions(session_id1: int, session_id2: int, db_session: Session = N
         session_created = True
     
     try:
-        session1 = db_session.query(CheckSession).filter(CheckSession.id == session_id1).first()
-        session2 = db_session.query(CheckSession).filter(CheckSession.id == session_id2).first()
+        # Both sessions in one query
+        sessions = {
+            s.id: s for s in db_session.query(CheckSession)
+                .filter(CheckSession.id.in_([session_id1, session_id2]))
+                .all()
+        }
+        session1 = sessions.get(session_id1)
+        session2 = sessions.get(session_id2)
         
         if not session1 or not session2:
             return {"error": "One or both sessions not found"}
         
-        # Get issues for both sessions
-        issues1 = db_session.query(Issue).filter(Issue.session_id == session_id1).all()
-        issues2 = db_session.query(Issue).filter(Issue.session_id == session_id2).all()
+        # Count issues by severity for both sessions in the database
+        # (issues without a severity count as medium)
+        severity = func.coalesce(Issue.severity, "medium")
+        rows = db_session.query(Issue.session_id, severity, func.count(Issue.id))\
+            .filter(Issue.session_id.in_([session_id1, session_id2]))\
+            .group_by(Issue.session_id, severity)\
+            .all()
         
-        # Count issues by severity
-        def count_by_severity(issues_list):
-            counts = {"high": 0, "medium": 0, "low": 0}
-            for issue in issues_list:
-                severity = issue.severity or "medium"
-                counts[severity] = counts.get(severity, 0) + 1
-            return counts
+        counts = {
+            session_id1: {"high": 0, "medium": 0, "low": 0},
+            session_id2: {"high": 0, "medium": 0, "low": 0}
+        }
+        for issue_session_id, issue_severity, count in rows:
+            counts[issue_session_id][issue_severity] = count
         
-        severity1 = count_by_severity(issues1)
-        severity2 = count_by_severity(issues2)
+        severity1 = counts[session_id1]
+        severity2 = counts[session_id2]
         
         # Calculate changes
         total_change = session2.issues_found - session1.issues_found
@@ -135,6 +189,9 @@ def get_quality_trend(session_id: int, days_back: int = 30, db_session: Session
     """
     Get quality trend for a session compared to previous sessions within a time period.
     
+    Without a db_session, results are cached for COMPARISON_CACHE_TTL seconds
+    per (session_id, days_back); callers get their own copy of the cached dict.
+    
     Args:
         session_id: ID of the current session
         days_back: Number of days to look back for comparison
@@ -143,66 +200,77 @@ def get_quality_trend(session_id: int, days_back: int = 30, db_session: Session
     Returns:
         Dictionary with trend analysis
     """
+    cache_key = ("trend", session_id, days_back)
     session_created = False
     if db_session is None:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
         db_session = SessionLocal()
         session_created = True
     
     try:
-        current_session = db_session.query(CheckSession).filter(CheckSession.id == session_id).first()
-        
-        if not current_session:
-            return {"error": "Session not found"}
-        
-        # Get previous sessions within the time period
-        cutoff_date = current_session.created_at - timedelta(days=days_back) if current_session.created_at else None
-        
-        query = db_session.query(CheckSession)\
-            .filter(CheckSession.id != session_id)
-        
-        if cutoff_date:
-            query = query.filter(CheckSession.created_at >= cutoff_date)
-        
-        previous_sessions = query.order_by(CheckSession.created_at.desc()).all()
-        
-        if not previous_sessions:
-            return {
-                "current_session": {
-                    "id": current_session.id,
-                    "filename": current_session.filename,
-                    "total_issues": current_session.issues_found
-                },
-                "trend": "no_previous_data",
-                "message": "No previous sessions found for comparison"
-            }
-        
-        # Calculate average issues from previous sessions
-        avg_issues = sum(s.issues_found for s in previous_sessions) / len(previous_sessions)
-        
-        trend = "stable"
-        if current_session.issues_found < avg_issues * 0.9:
-            trend = "improving"
-        elif current_session.issues_found > avg_issues * 1.1:
-            trend = "degrading"
-        
+        result = _compute_quality_trend(session_id, days_back, db_session)
+        if session_created and "error" not in result:
+            _cache_set(cache_key, copy.deepcopy(result))
+        return result
+    finally:
+        if session_created:
+            db_session.close()
+
+
+def _compute_quality_trend(session_id: int, days_back: int, db_session: Session) -> Dict:
+    """Build the get_quality_trend result from the database."""
+    current_session = db_session.query(CheckSession).filter(CheckSession.id == session_id).first()
+    
+    if not current_session:
+        return {"error": "Session not found"}
+    
+    # Get previous sessions within the time period
+    cutoff_date = current_session.created_at - timedelta(days=days_back) if current_session.created_at else None
+    
+    # Only the count and average are needed; aggregate them in the database
+    query = db_session.query(func.count(CheckSession.id), func.avg(CheckSession.issues_found))\
+        .filter(CheckSession.id != session_id)
+    
+    if cutoff_date:
+        query = query.filter(CheckSession.created_at >= cutoff_date)
+    
+    previous_count, avg_issues = query.one()
+    
+    if not previous_count:
         return {
             "current_session": {
                 "id": current_session.id,
                 "filename": current_session.filename,
-                "total_issues": current_session.issues_found,
-                "created_at": current_session.created_at.isoformat() if current_session.created_at else None
-            },
-            "comparison": {
-                "previous_sessions_count": len(previous_sessions),
-                "average_issues_in_period": round(avg_issues, 2),
-                "current_issues": current_session.issues_found,
-                "difference_from_average": round(current_session.issues_found - avg_issues, 2),
-                "difference_pct": round(((current_session.issues_found - avg_issues) / max(avg_issues, 1)) * 100, 2)
+                "total_issues": current_session.issues_found
             },
-            "trend": trend,
-            "period_days": days_back
+            "trend": "no_previous_data",
+            "message": "No previous sessions found for comparison"
         }
-    finally:
-        if session_created:
-            db_session.close()
-
+    
+    avg_issues = float(avg_issues or 0)
+    
+    trend = "stable"
+    if current_session.issues_found < avg_issues * 0.9:
+        trend = "improving"
+    elif current_session.issues_found > avg_issues * 1.1:
+        trend = "degrading"
+    
+    return {
+        "current_session": {
+            "id": current_session.id,
+            "filename": current_session.filename,
+            "total_issues": current_session.issues_found,
+            "created_at": current_session.created_at.isoformat() if current_session.created_at else None
+        },
+        "comparison": {
+            "previous_sessions_count": previous_count,
+            "average_issues_in_period": round(avg_issues, 2),
+            "current_issues": current_session.issues_found,
+            "difference_from_average": round(current_session.issues_found - avg_issues, 2),
+            "difference_pct": round(((current_session.issues_found - avg_issues) / max(avg_issues, 1)) * 100, 2)
+        },
+        "trend": trend,
+        "period_days": days_back
+    }
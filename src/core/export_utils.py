@@ -1,32 +1,159 @@
 
+import asyncio
 import os
-import markdown
-import pdfkit
-from pdfkit.configuration import Configuration
+import shutil
+import threading
+from functools import lru_cache, partial
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import quote
+
+# markdown, pdfkit and openpyxl are imported on first use, so callers that only
+# write Markdown (or only one format) don't pay for the others
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Compute absolute path to the HTML template
 TEMPLATE_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "templates", "report_template.html")
 )
 
+# wkhtmltopdf binary: WKHTMLTOPDF_PATH, else found on PATH, else the default Windows install
+WKHTMLTOPDF_PATH = (
+    os.getenv("WKHTMLTOPDF_PATH")
+    or shutil.which("wkhtmltopdf")
+    or r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
+)
+
+
+# wkhtmltopdf processes are RAM-heavy; cap how many run at once across worker threads
+PDF_MAX_CONCURRENCY = int(os.getenv("PDF_MAX_CONCURRENCY", "2"))
+_pdf_semaphore = threading.BoundedSemaphore(PDF_MAX_CONCURRENCY)
+
+
+@lru_cache(maxsize=1)
+def _pdfkit_configuration():
+    """Build the pdfkit configuration once (raises, uncached, if wkhtmltopdf is missing)."""
+    from pdfkit.configuration import Configuration
+    return Configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
+
+
+@lru_cache(maxsize=1)
+def _markdown_renderer():
+    """Builds the Markdown renderer once: markdown-it-py when installed, else Python-Markdown."""
+    try:
+        from markdown_it import MarkdownIt
+    except ImportError:
+        import markdown
+        return partial(markdown.markdown, extensions=['tables'])
+    return MarkdownIt("commonmark").enable("table").render
+
+
+def render_markdown(report_md: str) -> str:
+    """Converts Markdown (with tables) to HTML, using markdown-it-py when available."""
+    return _markdown_renderer()(report_md)
+
 
-def render_template(content: str, template_path: str) -> str:
-    """Reads an HTML template and injects the Markdown HTML content."""
+@lru_cache(maxsize=8)
+def _template_parts(template_path: str) -> tuple:
+    """Reads a template once and splits it around the {{content}} placeholder."""
     with open(template_path, "r", encoding="utf-8") as f:
         template = f.read()
-    return template.replace("{{content}}", content)
+    return template.partition("{{content}}")
+
+
+def render_template(content: str, template_path: str = TEMPLATE_PATH) -> str:
+    """Injects the Markdown HTML content into a (cached) HTML template."""
+    prefix, placeholder, suffix = _template_parts(template_path)
+    if not placeholder:
+        return prefix
+    return prefix + content + suffix
+
+
+# Folder (relative to the report) that save_html writes raw PNG charts to
+ASSETS_DIRNAME = "assets"
+
+# Chart blocks for save_html: (visualizations key, heading, alt text)
+_VIZ_CHARTS = (
+    ("missing_values", "Missing Values Count", "Missing Values Chart"),
+    ("missing_percentage", "Missing Values Percentage", "Missing Percentage Chart"),
+    ("issues_severity", "Issues by Severity", "Issues Severity Chart"),
+)
+
+_CHART_BLOCK = """
+            <div class='chart-container'>
+                <h3>{title}</h3>
+                <img src="{src}" alt="{alt}" class="chart-img">
+            </div>
+            """
+
+_DISTRIBUTION_BLOCK = """
+                <div class='distribution-chart'>
+                    <img src="{src}" alt="Distribution of {column}" class="chart-img">
+                </div>
+                """
+
+
+def _image_src(image, output_dir: str, asset_name: str) -> str:
+    """
+    Returns the <img> src for a chart.
+    
+    PNG bytes are written to an assets/ folder next to the report and linked
+    by relative path; base64 strings are embedded as data URIs.
+    """
+    if isinstance(image, bytes):
+        assets_dir = os.path.join(output_dir, ASSETS_DIRNAME)
+        os.makedirs(assets_dir, exist_ok=True)
+        with open(os.path.join(assets_dir, asset_name), "wb") as f:
+            f.write(image)
+        return f"{ASSETS_DIRNAME}/{quote(asset_name)}"
+    return f"data:image/png;base64,{image}"
+
+
+def _render_visualizations(visualizations: dict, output_dir: str, filename: str) -> str:
+    """Builds the visualizations section as a list of parts joined once."""
+    parts = ["<div class='visualizations'>\n<h2>📊 Visualizations</h2>\n"]
+    for key, title, alt in _VIZ_CHARTS:
+        if visualizations.get(key):
+            src = _image_src(visualizations[key], output_dir, f"{filename}_{key}.png")
+            parts.append(_CHART_BLOCK.format(title=title, src=src, alt=alt))
+    
+    # Add numeric distributions
+    if visualizations.get("numeric_distributions"):
+        parts.append("<div class='chart-container'><h3>Numeric Column Distributions</h3>")
+        for idx, (col_name, chart_img) in enumerate(visualizations["numeric_distributions"].items()):
+            # Column names aren't safe file names, so assets are numbered
+            src = _image_src(chart_img, output_dir, f"{filename}_distribution_{idx}.png")
+            parts.append(_DISTRIBUTION_BLOCK.format(src=src, column=col_name))
+        parts.append("</div>")
+    
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def _write_utf8(path: str, text: str):
+    """Encodes the text once and hands it to a single write(); payloads larger than
+    the buffer go straight to the file instead of in 8 KiB text-layer chunks."""
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
 
 
 def save_markdown(report_md: str, filename: str, output_dir: str = "reports") -> str:
     """Saves raw Markdown content to a .md file."""
     os.makedirs(output_dir, exist_ok=True)
     md_path = os.path.join(output_dir, f"{filename}.md")
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(report_md)
+    _write_utf8(md_path, report_md)
     return md_path
 
 
-def save_html(report_md: str, filename: str, output_dir: str = "reports", visualizations: dict = None) -> str:
+def save_html(
+    report_md: str,
+    filename: str,
+    output_dir: str = "reports",
+    visualizations: dict = None,
+    html_body: Optional[str] = None
+) -> str:
     """
     Converts Markdown to styled HTML using the template and saves it.
     
@@ -34,90 +161,79 @@ def save_html(report_md: str, filename: str, output_dir: str = "reports", visual
         report_md: Markdown content
         filename: Output filename (without extension)
         output_dir: Output directory
-        visualizations: Dictionary of base64-encoded chart images
+        visualizations: Dictionary of chart images; base64 strings are embedded
+            inline, PNG bytes are saved under assets/ and linked
+        html_body: report_md already converted by render_markdown, so a report
+            written in several formats is only parsed once
         
     Returns:
         Path to created HTML file
     """
     os.makedirs(output_dir, exist_ok=True)
-    html_body = markdown.markdown(report_md, extensions=['tables'])
+    if html_body is None:
+        html_body = render_markdown(report_md)
     
     # Add visualizations if provided
     if visualizations:
-        viz_html = "<div class='visualizations'>\n<h2>📊 Visualizations</h2>\n"
-        
-        if visualizations.get("missing_values"):
-            viz_html += f"""
-            <div class='chart-container'>
-                <h3>Missing Values Count</h3>
-                <img src="data:image/png;base64,{visualizations['missing_values']}" alt="Missing Values Chart" class="chart-img">
-            </div>
-            """
-        
-        if visualizations.get("missing_percentage"):
-            viz_html += f"""
-            <div class='chart-container'>
-                <h3>Missing Values Percentage</h3>
-                <img src="data:image/png;base64,{visualizations['missing_percentage']}" alt="Missing Percentage Chart" class="chart-img">
-            </div>
-            """
-        
-        if visualizations.get("issues_severity"):
-            viz_html += f"""
-            <div class='chart-container'>
-                <h3>Issues by Severity</h3>
-                <img src="data:image/png;base64,{visualizations['issues_severity']}" alt="Issues Severity Chart" class="chart-img">
-            </div>
-            """
-        
-        # Add numeric distributions
-        if visualizations.get("numeric_distributions"):
-            viz_html += "<div class='chart-container'><h3>Numeric Column Distributions</h3>"
-            for col_name, chart_img in visualizations["numeric_distributions"].items():
-                viz_html += f"""
-                <div class='distribution-chart'>
-                    <img src="data:image/png;base64,{chart_img}" alt="Distribution of {col_name}" class="chart-img">
-                </div>
-                """
-            viz_html += "</div>"
-        
-        viz_html += "</div>"
-        html_body = viz_html + html_body
+        html_body = _render_visualizations(visualizations, output_dir, filename) + html_body
     
     full_html = render_template(html_body, TEMPLATE_PATH)
 
     html_path = os.path.join(output_dir, f"{filename}.html")
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(full_html)
+    _write_utf8(html_path, full_html)
     return html_path
 
 
-def save_pdf(report_md: str, filename: str, output_dir: str = "reports") -> str:
-    """Converts Markdown to styled HTML and renders it as PDF using wkhtmltopdf."""
+def save_pdf(report_md: str, filename: str, output_dir: str = "reports", html_body: Optional[str] = None) -> str:
+    """
+    Converts Markdown to styled HTML and renders it as PDF using wkhtmltopdf.
+    
+    html_body, when given, is report_md already converted by render_markdown.
+    """
     os.makedirs(output_dir, exist_ok=True)
-    html_body = markdown.markdown(report_md, extensions=['tables'])
+    if html_body is None:
+        html_body = render_markdown(report_md)
     full_html = render_template(html_body, TEMPLATE_PATH)
 
-    temp_html_path = os.path.join(output_dir, f"{filename}.temp.html")
-    with open(temp_html_path, "w", encoding="utf-8") as f:
-        f.write(full_html)
+    import pdfkit
 
-    # Update this path if wkhtmltopdf is installed elsewhere
-    config = Configuration(wkhtmltopdf=r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe")
+    # Rendered straight from memory, without a temporary HTML file
     pdf_path = os.path.join(output_dir, f"{filename}.pdf")
-    pdfkit.from_file(temp_html_path, pdf_path, configuration=config)
-
-    os.remove(temp_html_path)
+    with _pdf_semaphore:
+        pdfkit.from_string(
+            full_html,
+            pdf_path,
+            configuration=_pdfkit_configuration(),
+            options={"enable-local-file-access": None, "quiet": ""}
+        )
     return pdf_path
 
 
+async def save_pdf_async(
+    report_md: str,
+    filename: str,
+    output_dir: str = "reports",
+    html_body: Optional[str] = None
+) -> str:
+    """Runs save_pdf in a worker thread so wkhtmltopdf doesn't block the event loop."""
+    return await asyncio.to_thread(save_pdf, report_md, filename, output_dir, html_body)
+
+
+# Rows per worksheet allowed by the XLSX format (header included)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Issue fields in Issues-sheet column order
+_ISSUE_FIELDS = itemgetter('row_number', 'column_name', 'issue_type', 'description', 'severity')
+
+
 def save_excel(
     df: "pd.DataFrame",
     validation_issues: list,
     validation_summary: dict,
     ml_recommendations: dict = None,
     filename: str = "report",
-    output_dir: str = "reports"
+    output_dir: str = "reports",
+    null_counts: "pd.Series" = None
 ) -> str:
     """
     Export data quality report to Excel format with multiple sheets.
@@ -129,13 +245,15 @@ def save_excel(
         ml_recommendations: Optional ML recommendations dictionary
         filename: Output filename (without extension)
         output_dir: Output directory
+        null_counts: Optional precomputed df.isnull().sum()
         
     Returns:
         Path to created Excel file
     """
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
         from openpyxl.utils import get_column_letter
         from datetime import datetime
     except ImportError:
@@ -144,126 +262,112 @@ def save_excel(
     os.makedirs(output_dir, exist_ok=True)
     excel_path = os.path.join(output_dir, f"{filename}.xlsx")
     
-    wb = Workbook()
+    # Write-only workbook: rows are streamed to the XML writer as they are
+    # appended, so memory stays flat however many issues there are
+    wb = Workbook(write_only=True)
     
-    # Sheet 1: Overview
-    ws_overview = wb.active
-    ws_overview.title = "Overview"
-    
-    # Header styling
+    # Styles are built once and shared by every cell that uses them
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     header_font = Font(color="FFFFFF", bold=True, size=12)
+    title_font = Font(bold=True, size=14)
+    section_font = Font(bold=True, size=12)
+    severity_fills = {
+        'high': PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid"),
+        'medium': PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid"),
+    }
+    low_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    
+    def styled(ws, value, font=None, fill=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
     
-    # Write overview data
-    ws_overview['A1'] = "Data Quality Report"
-    ws_overview['A1'].font = Font(bold=True, size=14)
-    ws_overview['A2'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-    ws_overview['A4'] = "Dataset Overview"
-    ws_overview['A4'].font = Font(bold=True, size=12)
-    ws_overview['A5'] = f"Rows: {df.shape[0]}"
-    ws_overview['A6'] = f"Columns: {df.shape[1]}"
-    ws_overview['A8'] = "Validation Summary"
-    ws_overview['A8'].font = Font(bold=True, size=12)
-    ws_overview['A9'] = f"Total Issues: {len(validation_issues)}"
-    ws_overview['A10'] = f"High Severity: {validation_summary.get('high', 0)}"
-    ws_overview['A11'] = f"Medium Severity: {validation_summary.get('medium', 0)}"
-    ws_overview['A12'] = f"Low Severity: {validation_summary.get('low', 0)}"
+    def header_row(ws, titles):
+        return [styled(ws, title, header_font, header_fill) for title in titles]
+    
+    def set_widths(ws, widths):
+        # Write-only sheets can't be measured after the fact, so widths are fixed
+        # up front (they must be set before the first row is appended)
+        for idx, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+    
+    # Sheet 1: Overview
+    ws_overview = wb.create_sheet("Overview")
+    set_widths(ws_overview, [40])
+    ws_overview.append([styled(ws_overview, "Data Quality Report", title_font)])
+    ws_overview.append([f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"])
+    ws_overview.append([])
+    ws_overview.append([styled(ws_overview, "Dataset Overview", section_font)])
+    ws_overview.append([f"Rows: {df.shape[0]}"])
+    ws_overview.append([f"Columns: {df.shape[1]}"])
+    ws_overview.append([])
+    ws_overview.append([styled(ws_overview, "Validation Summary", section_font)])
+    ws_overview.append([f"Total Issues: {len(validation_issues)}"])
+    ws_overview.append([f"High Severity: {validation_summary.get('high', 0)}"])
+    ws_overview.append([f"Medium Severity: {validation_summary.get('medium', 0)}"])
+    ws_overview.append([f"Low Severity: {validation_summary.get('low', 0)}"])
     
     if ml_recommendations:
-        ws_overview['A14'] = "ML Readiness"
-        ws_overview['A14'].font = Font(bold=True, size=12)
-        ws_overview['A15'] = f"Score: {ml_recommendations.get('readiness_score', 0)}/100"
-        ws_overview['A16'] = f"Level: {ml_recommendations.get('readiness_level', 'Unknown')}"
+        ws_overview.append([])
+        ws_overview.append([styled(ws_overview, "ML Readiness", section_font)])
+        ws_overview.append([f"Score: {ml_recommendations.get('readiness_score', 0)}/100"])
+        ws_overview.append([f"Level: {ml_recommendations.get('readiness_level', 'Unknown')}"])
     
     # Sheet 2: Missing Values
     ws_missing = wb.create_sheet("Missing Values")
-    ws_missing['A1'] = "Column"
-    ws_missing['B1'] = "Missing Count"
-    ws_missing['C1'] = "Missing Percentage"
+    set_widths(ws_missing, [30, 15, 20])
+    ws_missing.append(header_row(ws_missing, ["Column", "Missing Count", "Missing Percentage"]))
     
-    for cell in ['A1', 'B1', 'C1']:
-        ws_missing[cell].fill = header_fill
-        ws_missing[cell].font = header_font
+    # One vectorized reduction; only columns with gaps are iterated
+    missing_data = null_counts if null_counts is not None else df.isnull().sum()
+    missing_data = missing_data[missing_data > 0]
+    missing_pct = missing_data * 100.0 / len(df)
     
-    missing_data = df.isnull().sum()
-    missing_pct = (missing_data / len(df)) * 100
-    
-    row = 2
-    for col in df.columns:
-        if missing_data[col] > 0:
-            ws_missing[f'A{row}'] = col
-            ws_missing[f'B{row}'] = missing_data[col]
-            ws_missing[f'C{row}'] = f"{missing_pct[col]:.2f}%"
-            row += 1
+    for col, count, pct in zip(missing_data.index, missing_data.tolist(), missing_pct.tolist()):
+        ws_missing.append([col, count, f"{pct:.2f}%"])
     
     # Sheet 3: Issues
     ws_issues = wb.create_sheet("Issues")
-    ws_issues['A1'] = "Row"
-    ws_issues['B1'] = "Column"
-    ws_issues['C1'] = "Issue Type"
-    ws_issues['D1'] = "Description"
-    ws_issues['E1'] = "Severity"
+    set_widths(ws_issues, [10, 20, 20, 50, 12])
+    ws_issues.append(header_row(ws_issues, ["Row", "Column", "Issue Type", "Description", "Severity"]))
     
-    for cell in ['A1', 'B1', 'C1', 'D1', 'E1']:
-        ws_issues[cell].fill = header_fill
-        ws_issues[cell].font = header_font
+    if not validation_issues:
+        ws_issues.append(["No issues found"])
     
-    row = 2
-    for issue in validation_issues:
-        ws_issues[f'A{row}'] = issue.get('row_number', 'N/A')
-        ws_issues[f'B{row}'] = issue.get('column_name', 'N/A')
-        ws_issues[f'C{row}'] = issue.get('issue_type', 'N/A')
-        ws_issues[f'D{row}'] = issue.get('description', 'N/A')
-        severity = issue.get('severity', 'medium')
-        ws_issues[f'E{row}'] = severity
-        
-        # Color code by severity
-        if severity == 'high':
-            ws_issues[f'E{row}'].fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-        elif severity == 'medium':
-            ws_issues[f'E{row}'].fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
-        else:
-            ws_issues[f'E{row}'].fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        
-        row += 1
+    # Issues past the sheet's row limit are left out (the overview still counts them)
+    for issue in islice(validation_issues, EXCEL_MAX_ROWS - 1):
+        try:
+            # Validator output always carries every key; fetch them in one call
+            row_number, column_name, issue_type, description, severity = _ISSUE_FIELDS(issue)
+        except KeyError:
+            row_number = issue.get('row_number', 'N/A')
+            column_name = issue.get('column_name', 'N/A')
+            issue_type = issue.get('issue_type', 'N/A')
+            description = issue.get('description', 'N/A')
+            severity = issue.get('severity', 'medium')
+        ws_issues.append([
+            row_number,
+            column_name,
+            issue_type,
+            description,
+            # Color code by severity
+            styled(ws_issues, severity, fill=severity_fills.get(severity, low_fill))
+        ])
     
-    # Sheet 4: Statistics
-    ws_stats = wb.create_sheet("Statistics")
+    # Sheet 4: Statistics (only when there are numeric columns to describe)
     numeric_df = df.select_dtypes(include=['number'])
     
     if len(numeric_df.columns) > 0:
+        ws_stats = wb.create_sheet("Statistics")
         stats = numeric_df.describe()
         
-        # Write headers
-        ws_stats['A1'] = "Statistic"
-        for idx, col in enumerate(stats.columns, start=2):
-            ws_stats.cell(row=1, column=idx, value=col)
-        
-        for cell in range(1, len(stats.columns) + 2):
-            ws_stats.cell(row=1, column=cell).fill = header_fill
-            ws_stats.cell(row=1, column=cell).font = header_font
-        
-        # Write statistics
-        row = 2
-        for stat_name in stats.index:
-            ws_stats.cell(row=row, column=1, value=stat_name)
-            for col_idx, col_name in enumerate(stats.columns, start=2):
-                ws_stats.cell(row=row, column=col_idx, value=stats.loc[stat_name, col_name])
-            row += 1
-    
-    # Auto-adjust column widths
-    for ws in wb.worksheets:
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        set_widths(ws_stats, [15] * (len(stats.columns) + 1))
+        ws_stats.append(header_row(ws_stats, ["Statistic", *stats.columns]))
+        for stat_row in stats.itertuples(name=None):
+            ws_stats.append(stat_row)
     
     wb.save(excel_path)
     return excel_path
@@ -1,19 +1,39 @@
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, BinaryIO, Tuple
 from src.core.reporting import generate_markdown_report
-from src.core.export_utils import save_markdown, save_html, save_pdf, save_excel
+from src.core.export_utils import save_markdown, save_html, save_pdf, save_excel, render_markdown
 from src.core.validator import validate_dataframe
-from src.core.ml_advisor import get_ml_recommendations
-from src.core.visualizations import (
-    generate_missing_values_chart,
-    generate_missing_percentage_chart,
-    generate_issues_severity_chart,
-    generate_all_numeric_distributions
-)
-from src.db.database import SessionLocal, engine, Base
+from src.core.data_loader import read_csv
+from sqlalchemy import insert
+from src.db.database import SessionLocal, init_db
 from src.db.models import CheckSession, Issue
+from src.core.comparison import clear_comparison_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import orjson
+
+# Bytes read from the start of a JSON file to tell JSON Lines from a JSON document
+JSON_SNIFF_BYTES = 1 << 20
+
+
+def _is_json_lines(source) -> bool:
+    """True if the first line is a complete JSON object and more lines follow it."""
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            head = f.read(JSON_SNIFF_BYTES)
+    else:
+        position = source.tell()
+        head = source.read(JSON_SNIFF_BYTES)
+        source.seek(position)
+    
+    first_line, _, rest = head.lstrip().partition(b"\n")
+    if not first_line.startswith(b"{") or not rest.strip():
+        return False
+    try:
+        return isinstance(orjson.loads(first_line), dict)
+    except orjson.JSONDecodeError:
+        return False
 
 
 def save_check_to_db(
@@ -42,11 +62,10 @@ def save_check_to_db(
         session_created = True
     
     try:
-        # Ensure tables exist
-        Base.metadata.create_all(bind=engine)
+        # Ensure tables exist (DDL only runs on the first call)
+        init_db()
         
-        # Count issues by severity
-        high_severity_count = sum(1 for issue in validation_issues if issue.get('severity') == 'high')
+        now = datetime.utcnow()
         
         # Create CheckSession
         check_session = CheckSession(
@@ -54,26 +73,31 @@ def save_check_to_db(
             file_format=file_format,
             rows=rows,
             issues_found=len(validation_issues),
-            created_at=datetime.utcnow()
+            created_at=now
         )
         
         db_session.add(check_session)
         db_session.flush()  # Get the ID
         
-        # Create Issue records
-        for issue_dict in validation_issues:
-            issue = Issue(
-                session_id=check_session.id,
-                row_number=issue_dict.get('row_number'),
-                column_name=issue_dict.get('column_name'),
-                issue_type=issue_dict.get('issue_type'),
-                description=issue_dict.get('description'),
-                severity=issue_dict.get('severity', 'medium'),
-                detected_at=datetime.utcnow()
-            )
-            db_session.add(issue)
+        # Create Issue records in one executemany INSERT, without building ORM objects
+        issue_rows = [
+            {
+                "session_id": check_session.id,
+                "row_number": issue_dict.get('row_number'),
+                "column_name": issue_dict.get('column_name'),
+                "issue_type": issue_dict.get('issue_type'),
+                "description": issue_dict.get('description'),
+                "severity": issue_dict.get('severity', 'medium'),
+                "detected_at": now
+            }
+            for issue_dict in validation_issues
+        ]
+        if issue_rows:
+            db_session.execute(insert(Issue), issue_rows)
         
         db_session.commit()
+        # Cached recent-session lists and trends no longer reflect the history
+        clear_comparison_cache()
         return check_session.id
     
     except Exception as e:
@@ -86,12 +110,39 @@ def save_check_to_db(
             db_session.close()
 
 
+def _ml_insights(
+    df: pd.DataFrame,
+    validation_issues: list[dict],
+    null_counts: pd.Series
+) -> Tuple[Dict, str]:
+    """
+    Get ML recommendations and format them as Markdown for the report.
+    
+    The ML advisor is imported here so runs without AI insights never load it.
+    
+    Returns:
+        Tuple of (recommendations dictionary, Markdown text)
+    """
+    from src.core.ml_advisor import get_ml_recommendations
+    
+    ml_recommendations = get_ml_recommendations(df, validation_issues, null_counts)
+    ml_insights = ""
+    # Format ML recommendations as text
+    if ml_recommendations.get('recommendations'):
+        ml_insights = f"**ML Readiness Score**: {ml_recommendations['readiness_score']}/100 ({ml_recommendations['readiness_level']})\n\n"
+        ml_insights += "**Recommendations for ML Preparation:**\n\n"
+        for rec in ml_recommendations['recommendations'][:15]:  # Limit to first 15
+            ml_insights += f"- {rec}\n"
+    return ml_recommendations, ml_insights
+
+
 def generate_data_quality_report(
     input_path: Path,
     report_format: str = "pdf",
     include_ai: bool = True,
     client_name: Optional[str] = None,
-    save_to_db: bool = True
+    save_to_db: bool = True,
+    input_buffer: Optional[BinaryIO] = None
 ) -> dict:
     """
     Generates a data quality report from a CSV/JSON file and exports it.
@@ -102,32 +153,32 @@ def generate_data_quality_report(
         include_ai (bool): Whether to include AI-based insights
         client_name (str, optional): Optional client name for the report
         save_to_db (bool): Whether to save check results to database
+        input_buffer (BinaryIO, optional): In-memory file contents. When given, the
+            dataset is read from this buffer and input_path only supplies the name
 
     Returns:
         dict: Paths to generated report files and session_id if saved to DB
     """
     # Load the dataset
+    source = input_buffer if input_buffer is not None else input_path
     if input_path.suffix == ".csv":
-        df = pd.read_csv(input_path)
+        df = read_csv(source)
     elif input_path.suffix == ".json":
-        df = pd.read_json(input_path)
+        df = pd.read_json(source, lines=_is_json_lines(source))
     else:
         raise ValueError("Unsupported file format. Only CSV and JSON are supported.")
 
+    # Missing counts per column, computed in one pass and shared by every step below
+    null_counts = df.isnull().sum()
+
     # Run validation
-    validation_issues, validation_summary = validate_dataframe(df)
+    validation_issues, validation_summary = validate_dataframe(df, null_counts)
     
     # Get ML recommendations if requested
-    ml_recommendations = None
-    ml_insights = ""
     if include_ai:
-        ml_recommendations = get_ml_recommendations(df, validation_issues)
-        # Format ML recommendations as text
-        if ml_recommendations.get('recommendations'):
-            ml_insights = f"**ML Readiness Score**: {ml_recommendations['readiness_score']}/100 ({ml_recommendations['readiness_level']})\n\n"
-            ml_insights += "**Recommendations for ML Preparation:**\n\n"
-            for rec in ml_recommendations['recommendations'][:15]:  # Limit to first 15
-                ml_insights += f"- {rec}\n"
+        ml_recommendations, ml_insights = _ml_insights(df, validation_issues, null_counts)
+    else:
+        ml_recommendations, ml_insights = None, ""
     
     # Convert validation issues to readable format for report
     issue_texts = []
@@ -151,8 +202,9 @@ def generate_data_quality_report(
     markdown = generate_markdown_report(
         df, 
         issue_texts, 
-        ml_insights if include_ai else "", 
-        client_name
+        ml_insights, 
+        client_name,
+        null_counts=null_counts
     )
 
     filename = input_path.stem
@@ -160,18 +212,37 @@ def generate_data_quality_report(
 
     # Generate visualizations for HTML reports
     visualizations = {}
-    if report_format in ("html", "all", "xlsx"):
-        visualizations["missing_values"] = generate_missing_values_chart(df)
-        visualizations["missing_percentage"] = generate_missing_percentage_chart(df)
-        visualizations["issues_severity"] = generate_issues_severity_chart(validation_issues)
-        visualizations["numeric_distributions"] = generate_all_numeric_distributions(df)
+    if report_format in ("html", "all"):
+        # Imported here so runs without an HTML report never load matplotlib
+        from src.core.visualizations import (
+            CHART_WORKERS,
+            generate_missing_values_chart,
+            generate_missing_percentage_chart,
+            generate_issues_severity_chart,
+            generate_all_numeric_distributions
+        )
+        
+        # Raw PNG bytes: save_html writes them next to the report instead of inlining base64.
+        # The charts are independent, so they are rendered concurrently
+        with ThreadPoolExecutor(max_workers=CHART_WORKERS) as pool:
+            futures = {
+                "missing_values": pool.submit(generate_missing_values_chart, df, raw=True, null_counts=null_counts),
+                "missing_percentage": pool.submit(
+                    generate_missing_percentage_chart, df, raw=True, null_counts=null_counts
+                ),
+                "issues_severity": pool.submit(generate_issues_severity_chart, validation_issues, raw=True),
+                "numeric_distributions": pool.submit(generate_all_numeric_distributions, df, raw=True),
+            }
+            visualizations = {name: future.result() for name, future in futures.items()}
 
     if report_format in ("md", "all"):
         output_paths["markdown"] = save_markdown(markdown, filename)
+    # Converted to HTML once and shared by the HTML and PDF writers
+    html_body = render_markdown(markdown) if report_format in ("html", "pdf", "all") else None
     if report_format in ("html", "all"):
-        output_paths["html"] = save_html(markdown, filename, visualizations=visualizations)
+        output_paths["html"] = save_html(markdown, filename, visualizations=visualizations, html_body=html_body)
     if report_format in ("pdf", "all"):
-        output_paths["pdf"] = save_pdf(markdown, filename)
+        output_paths["pdf"] = save_pdf(markdown, filename, html_body=html_body)
     if report_format in ("xlsx", "excel", "all"):
         try:
             output_paths["excel"] = save_excel(
@@ -179,7 +250,8 @@ def generate_data_quality_report(
                 validation_issues=validation_issues,
                 validation_summary=validation_summary,
                 ml_recommendations=ml_recommendations,
-                filename=filename
+                filename=filename,
+                null_counts=null_counts
             )
         except ImportError:
             output_paths["excel"] = None  # openpyxl not installed
@@ -0,0 +1,82 @@
+"""
+Shared async HTTP client for outgoing requests.
+
+Reusing one pooled client keeps connections (and TLS sessions) alive
+between webhook deliveries instead of reconnecting on every call.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# Default timeout for outgoing requests (callers may override per request)
+DEFAULT_TIMEOUT = 30.0
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Task on _client_loop that closes _client when that loop shuts down
+_client_closer: Optional[asyncio.Task] = None
+
+
+async def _close_on_loop_shutdown(client: httpx.AsyncClient):
+    """
+    Wait until the client's event loop shuts down, then close the client.
+
+    asyncio.run() cancels leftover tasks and waits for them before closing
+    the loop, so the pooled connections are released while the loop they
+    belong to can still run their cleanup.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
+
+def _retire_client():
+    """Close the current client, which belongs to another event loop."""
+    if _client_closer is not None and _client_loop.is_running():
+        # Still running in another thread; close the client there
+        _client_loop.call_soon_threadsafe(_client_closer.cancel)
+    # Otherwise the closer runs when that loop is shut down
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client, creating it on first use.
+
+    Pooled connections belong to the event loop that opened them, so a new
+    client is created if called from a different loop. Each client is closed
+    on its own loop, when replaced or when that loop shuts down.
+
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    global _client, _client_loop, _client_closer
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _retire_client()
+        _client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        _client_loop = loop
+        _client_closer = loop.create_task(_close_on_loop_shutdown(_client))
+
+    return _client
+
+
+async def close_http_client():
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _client, _client_loop, _client_closer
+    client, loop, closer = _client, _client_loop, _client_closer
+    _client = None
+    _client_loop = None
+    _client_closer = None
+    if closer is not None and loop is asyncio.get_running_loop():
+        closer.cancel()
+        await asyncio.wait([closer])
+    elif client is not None:
+        await client.aclose()
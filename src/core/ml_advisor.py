@@ -12,18 +12,64 @@ Analyzes datasets and provides actionable insights on:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
+from functools import cached_property
+
+
+def _high_correlation_pairs(numeric_df: pd.DataFrame, threshold: float) -> List[Tuple[str, str]]:
+    """
+    Column pairs whose absolute Pearson correlation exceeds the threshold.
+    
+    Uses np.corrcoef on the whole matrix when there are no missing values and
+    falls back to pandas' pairwise-complete DataFrame.corr otherwise. Constant
+    columns correlate as NaN and never match, as with pandas.
+    """
+    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any():
+        corr = numeric_df.corr().to_numpy()
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(values, rowvar=False)
+    
+    rows, cols = np.triu_indices_from(corr, k=1)
+    upper = corr[rows, cols]
+    hits = np.flatnonzero((upper > threshold) | (upper < -threshold))
+    columns = numeric_df.columns
+    return [(columns[rows[k]], columns[cols[k]]) for k in hits]
 
 
 class MLAdvisor:
     """Provides ML-focused recommendations for data preparation."""
     
-    def __init__(self, df: pd.DataFrame, validation_issues: Optional[List[Dict]] = None):
-        self.df = df.copy()
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        validation_issues: Optional[List[Dict]] = None,
+        null_counts: Optional[pd.Series] = None
+    ):
+        # Read-only: no check mutates the frame, so keep a reference instead of a copy
+        self.df = df
         self.validation_issues = validation_issues or []
+        # Per-column missing counts, when the caller has already computed them
+        self.null_counts = null_counts
         self.recommendations: List[str] = []
         self.readiness_score: float = 0.0
+        self._unique_counts: Dict[str, int] = {}
+    
+    @cached_property
+    def _numeric_stats(self) -> pd.DataFrame:
+        """min/max/mean/std/count of every numeric column, from one aggregation pass."""
+        numeric_df = self.df.select_dtypes(include=[np.number])
+        if numeric_df.columns.empty:
+            return pd.DataFrame(index=['min', 'max', 'mean', 'std', 'count'])
+        return numeric_df.agg(['min', 'max', 'mean', 'std', 'count'])
+    
+    def _nunique(self, col: str) -> int:
+        """Distinct non-null values in a column, counted once per column."""
+        if col not in self._unique_counts:
+            self._unique_counts[col] = self.df[col].nunique()
+        return self._unique_counts[col]
     
     def analyze(self) -> Dict:
         """
@@ -93,14 +139,19 @@ class MLAdvisor:
     def _analyze_missing_values(self) -> Dict:
         """Analyze missing values and provide handling strategies."""
         recommendations = []
-        missing = self.df.isnull().sum()
+        total_rows = len(self.df)
+        # df.count() runs on the column blocks without building an n*m bool mask
+        if self.null_counts is None:
+            self.null_counts = total_rows - self.df.count()
+        missing = self.null_counts
         total_missing = missing.sum()
-        total_cells = len(self.df) * len(self.df.columns)
+        total_cells = total_rows * len(self.df.columns)
         total_missing_pct = (total_missing / total_cells) * 100 if total_cells > 0 else 0
         
         if total_missing > 0:
             # High missing values threshold
-            high_missing_cols = missing[missing > len(self.df) * 0.5].index.tolist()
+            high_mask = missing > total_rows * 0.5
+            high_missing_cols = missing.index[high_mask].tolist()
             
             if high_missing_cols:
                 recommendations.append(
@@ -109,7 +160,7 @@ class MLAdvisor:
                 )
             
             # Medium missing values - imputation strategies
-            medium_missing_cols = missing[(missing > len(self.df) * 0.1) & (missing <= len(self.df) * 0.5)].index.tolist()
+            medium_missing_cols = missing.index[(missing > total_rows * 0.1) & ~high_mask].tolist()
             
             if medium_missing_cols:
                 for col in medium_missing_cols[:5]:
@@ -136,15 +187,22 @@ class MLAdvisor:
         recommendations = []
         
         # Look for columns that might be target variables
-        potential_targets = [col for col in self.df.columns 
-                           if self.df[col].dtype in ['object', 'int64'] 
-                           and self.df[col].nunique() < 20]
+        # Object/string and integer columns; kind also covers pandas' str dtype
+        candidates = [col for col in self.df.columns 
+                      if self.df[col].dtype.kind in 'OiU']
+        # Seed the per-column cache with one batched nunique over the candidates
+        uncounted = [col for col in candidates if col not in self._unique_counts]
+        if uncounted:
+            self._unique_counts.update(self.df[uncounted].nunique().to_dict())
+        potential_targets = [col for col in candidates if self._nunique(col) < 20]
         
         for col in potential_targets[:3]:  # Check first 3 potential targets
-            value_counts = self.df[col].value_counts()
+            # Factorized codes give class sizes via bincount, without value_counts' sort
+            codes, _ = pd.factorize(self.df[col])
+            class_counts = np.bincount(codes[codes >= 0])
             
-            if len(value_counts) > 1:
-                max_class_pct = (value_counts.iloc[0] / len(self.df)) * 100
+            if len(class_counts) > 1:
+                max_class_pct = (class_counts.max() / len(self.df)) * 100
                 
                 # Severe imbalance (>80% in one class)
                 if max_class_pct > 80:
@@ -182,14 +240,10 @@ class MLAdvisor:
             
             # Check for high correlation pairs (potential for feature selection)
             if len(numeric_cols) > 1:
-                corr_matrix = self.df[numeric_cols].corr().abs()
-                high_corr_pairs = []
-                for i in range(len(corr_matrix.columns)):
-                    for j in range(i+1, len(corr_matrix.columns)):
-                        if corr_matrix.iloc[i, j] > 0.8:
-                            high_corr_pairs.append(
-                                f"{corr_matrix.columns[i]} & {corr_matrix.columns[j]}"
-                            )
+                high_corr_pairs = [
+                    f"{first} & {second}"
+                    for first, second in _high_correlation_pairs(self.df[numeric_cols], 0.8)
+                ]
                 
                 if high_corr_pairs:
                     recommendations.append(
@@ -200,7 +254,7 @@ class MLAdvisor:
         # Categorical feature engineering
         if categorical_cols:
             high_cardinality = [col for col in categorical_cols 
-                              if self.df[col].nunique() > 20]
+                              if self._nunique(col) > 20]
             
             if high_cardinality:
                 recommendations.append(
@@ -210,7 +264,7 @@ class MLAdvisor:
             
             # Check for potential ordinal encoding opportunities
             low_cardinality = [col for col in categorical_cols 
-                             if 2 <= self.df[col].nunique() <= 10]
+                             if 2 <= self._nunique(col) <= 10]
             
             if low_cardinality:
                 recommendations.append(
@@ -227,7 +281,7 @@ class MLAdvisor:
             return recommendations
         
         for col in categorical_cols[:5]:  # Analyze first 5
-            unique_count = self.df[col].nunique()
+            unique_count = self._nunique(col)
             
             if unique_count == 2:
                 recommendations.append(
@@ -257,16 +311,19 @@ class MLAdvisor:
         if not numeric_cols:
             return recommendations
         
+        stats = self._numeric_stats
+        
         # Check for wide ranges (need normalization)
         for col in numeric_cols[:5]:
-            if self.df[col].notna().any():
-                col_min = self.df[col].min()
-                col_max = self.df[col].max()
-                col_std = self.df[col].std()
+            if stats.at['count', col] > 0:
+                col_min = stats.at['min', col]
+                col_max = stats.at['max', col]
+                col_std = stats.at['std', col]
+                col_mean = stats.at['mean', col]
                 
                 # Large range or high variance
                 if col_std > 0:
-                    cv = col_std / abs(self.df[col].mean()) if self.df[col].mean() != 0 else float('inf')
+                    cv = col_std / abs(col_mean) if col_mean != 0 else float('inf')
                     
                     if abs(col_max - col_min) > 1000 or cv > 1:
                         recommendations.append(
@@ -301,12 +358,9 @@ class MLAdvisor:
             )
         
         # Check for low variance features
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) > 0:
-            low_variance = []
-            for col in numeric_cols:
-                if self.df[col].std() < 0.01:  # Very low variance
-                    low_variance.append(col)
+        stds = self._numeric_stats.loc['std']
+        if len(stds) > 0:
+            low_variance = stds.index[stds < 0.01].tolist()  # Very low variance
             
             if low_variance:
                 recommendations.append(
@@ -378,17 +432,22 @@ class MLAdvisor:
             return "Very Poor - Major data issues"
 
 
-def get_ml_recommendations(df: pd.DataFrame, validation_issues: Optional[List[Dict]] = None) -> Dict:
+def get_ml_recommendations(
+    df: pd.DataFrame,
+    validation_issues: Optional[List[Dict]] = None,
+    null_counts: Optional[pd.Series] = None
+) -> Dict:
     """
     Main function to get ML recommendations.
     
     Args:
         df: pandas DataFrame to analyze
         validation_issues: Optional list of validation issues from validator
+        null_counts: Optional precomputed df.isnull().sum()
         
     Returns:
         Dictionary with recommendations and readiness score
     """
-    advisor = MLAdvisor(df, validation_issues)
+    advisor = MLAdvisor(df, validation_issues, null_counts)
     return advisor.analyze()
 
@@ -5,7 +5,8 @@ def generate_markdown_report(
         df: pd.DataFrame,
         issues: list[str],
         ai_insights: str = "",
-        client_name: str = None
+        client_name: str = None,
+        null_counts: pd.Series = None
 ) -> str:
     """
     Generate a structured Markdown report with basic statistics, missing values,
@@ -15,6 +16,7 @@ def generate_markdown_report(
     :param issues: List of textual issues found during validation
     :param ai_insights: Optional AI-generated interpretation of data quality
     :param client_name: Optional client or company name
+    :param null_counts: Optional precomputed df.isnull().sum()
     :return: Markdown-formatted string
     """
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -39,7 +41,8 @@ def generate_markdown_report(
 
     report.append("## 🔎 Missing Values")
     try:
-        report.append(df.isnull().sum().to_markdown())
+        missing = null_counts if null_counts is not None else df.isnull().sum()
+        report.append(missing.to_markdown())
     except Exception as e:
         report.append(f"_Error computing nulls: {e}_")
     report.append("")
@@ -4,13 +4,106 @@ URL Loader - Download and process files from URLs.
 Supports downloading CSV, JSON, and XML files from HTTP/HTTPS URLs.
 """
 
-import requests
+import asyncio
+import httpx
 from pathlib import Path
 from typing import Optional
 from fastapi import HTTPException
 import tempfile
 import os
 
+from src.core.utils.file_utils import UPLOAD_DIR
+from src.core.http_client import get_http_client
+
+# Read the response body in large chunks to keep per-chunk overhead low
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+# Hard cap on downloaded files, enforced before and during streaming
+MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 100MB
+
+
+def _file_too_large(size: int) -> HTTPException:
+    """Build the error raised for downloads over MAX_DOWNLOAD_SIZE."""
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large ({size / 1024 / 1024:.1f}MB). Maximum size is 100MB."
+    )
+
+
+async def _save_response(response: httpx.Response, url: str) -> Path:
+    """
+    Write a streamed response to a new file in the uploads directory.
+    
+    Stops reading and removes the partial file as soon as the body grows
+    past MAX_DOWNLOAD_SIZE.
+    
+    Args:
+        response: Open streaming response
+        url: URL the response came from (used for the file name)
+        
+    Returns:
+        Path to the written file
+        
+    Raises:
+        HTTPException if the body exceeds MAX_DOWNLOAD_SIZE
+    """
+    # Check content type (optional, but helpful)
+    content_type = response.headers.get('content-type', '').lower()
+    if 'text/csv' not in content_type and 'application/json' not in content_type and 'text/xml' not in content_type:
+        # Allow if content-type is not set (some servers don't set it)
+        if content_type and 'text' not in content_type and 'application' not in content_type:
+            # Not a blocking error, just a warning
+            pass
+    
+    # Determine file extension from URL or Content-Type
+    filename = None
+    if 'Content-Disposition' in response.headers:
+        content_disposition = response.headers['Content-Disposition']
+        if 'filename=' in content_disposition:
+            filename = content_disposition.split('filename=')[1].strip('"\'')
+    
+    if not filename:
+        # Try to get from URL
+        filename = url.split('/')[-1].split('?')[0]  # Remove query params
+    
+    # Determine extension from filename or content-type
+    if '.' not in filename or len(filename.split('.')[-1]) > 5:
+        # No extension or weird extension, try content-type
+        if 'csv' in content_type:
+            extension = '.csv'
+        elif 'json' in content_type:
+            extension = '.json'
+        elif 'xml' in content_type:
+            extension = '.xml'
+        else:
+            # Default to CSV for data files
+            extension = '.csv'
+        
+        if '.' not in filename:
+            filename = f"downloaded_file{extension}"
+        else:
+            filename = filename.rsplit('.', 1)[0] + extension
+    
+    # Create temporary file
+    temp_file_path = UPLOAD_DIR / f"url_{os.urandom(8).hex()}_{filename}"
+    
+    # Stream downloaded content to disk chunk by chunk; the file operations
+    # run in a worker thread so they don't block the event loop
+    f = await asyncio.to_thread(open, temp_file_path, 'wb')
+    total = 0
+    try:
+        async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_DOWNLOAD_SIZE:
+                raise _file_too_large(total)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        temp_file_path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(f.close)
+    
+    return temp_file_path
+
 
 async def download_file_from_url(url: str, timeout: int = 30) -> Path:
     """
@@ -34,69 +127,23 @@ async def download_file_from_url(url: str, timeout: int = 30) -> Path:
         )
     
     try:
-        # Download file with timeout
-        response = requests.get(url, timeout=timeout, stream=True, allow_redirects=True)
-        response.raise_for_status()
-        
-        # Check content type (optional, but helpful)
-        content_type = response.headers.get('content-type', '').lower()
-        if 'text/csv' not in content_type and 'application/json' not in content_type and 'text/xml' not in content_type:
-            # Allow if content-type is not set (some servers don't set it)
-            if content_type and 'text' not in content_type and 'application' not in content_type:
-                # Not a blocking error, just a warning
-                pass
-        
-        # Determine file extension from URL or Content-Type
-        filename = None
-        if 'Content-Disposition' in response.headers:
-            content_disposition = response.headers['Content-Disposition']
-            if 'filename=' in content_disposition:
-                filename = content_disposition.split('filename=')[1].strip('"\'')
-        
-        if not filename:
-            # Try to get from URL
-            filename = url.split('/')[-1].split('?')[0]  # Remove query params
-        
-        # Determine extension from filename or content-type
-        if '.' not in filename or len(filename.split('.')[-1]) > 5:
-            # No extension or weird extension, try content-type
-            if 'csv' in content_type:
-                extension = '.csv'
-            elif 'json' in content_type:
-                extension = '.json'
-            elif 'xml' in content_type:
-                extension = '.xml'
-            else:
-                # Default to CSV for data files
-                extension = '.csv'
+        # Download file with timeout on the shared pooled client
+        async with get_http_client().stream("GET", url, timeout=timeout, follow_redirects=True) as response:
+            response.raise_for_status()
             
-            if '.' not in filename:
-                filename = f"downloaded_file{extension}"
-            else:
-                filename = filename.rsplit('.', 1)[0] + extension
-        
-        # Create temporary file
-        temp_dir = Path("tmp/uploads")
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        
-        temp_file_path = temp_dir / f"url_{os.urandom(8).hex()}_{filename}"
-        
-        # Save downloaded content
-        with open(temp_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+            # Refuse oversized files up front when the server declares a length
+            content_length = response.headers.get('content-length', '')
+            if content_length.isdigit() and int(content_length) > MAX_DOWNLOAD_SIZE:
+                raise _file_too_large(int(content_length))
+            
+            temp_file_path = await _save_response(response, url)
         
         # Validate file size (max 100MB for safety)
         file_size = temp_file_path.stat().st_size
-        max_size = 100 * 1024 * 1024  # 100MB
         
-        if file_size > max_size:
+        if file_size > MAX_DOWNLOAD_SIZE:
             temp_file_path.unlink(missing_ok=True)
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large ({file_size / 1024 / 1024:.1f}MB). Maximum size is 100MB."
-            )
+            raise _file_too_large(file_size)
         
         if file_size == 0:
             temp_file_path.unlink(missing_ok=True)
@@ -107,25 +154,28 @@ async def download_file_from_url(url: str, timeout: int = 30) -> Path:
         
         return temp_file_path
     
-    except requests.exceptions.Timeout:
+    except HTTPException:
+        raise
+    
+    except httpx.TimeoutException:
         raise HTTPException(
             status_code=408,
             detail=f"Request timeout after {timeout} seconds. URL may be unreachable or file too large."
         )
     
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         raise HTTPException(
             status_code=503,
             detail="Failed to connect to URL. Check if the URL is accessible and the server is running."
         )
     
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         raise HTTPException(
-            status_code=e.response.status_code if hasattr(e, 'response') else 400,
+            status_code=e.response.status_code,
             detail=f"HTTP error: {str(e)}"
         )
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=400,
             detail=f"Failed to download file: {str(e)}"
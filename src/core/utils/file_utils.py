@@ -0,0 +1,46 @@
+"""
+File helpers shared by the upload endpoints.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO
+
+# Buffer size for user-space copies (the shutil default is only 16-64KB)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Directory for temporary copies of uploaded/downloaded files.
+# Created once here instead of on every request.
+UPLOAD_DIR = Path("tmp/uploads")
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def copy_upload_to_path(source: BinaryIO, destination: Path) -> None:
+    """
+    Copy an uploaded file object to ``destination``.
+
+    When the upload has been rolled over to a real file on disk, the bytes are
+    copied in the kernel with ``os.copy_file_range``. Otherwise (in-memory
+    spool, non-Linux platforms, unsupported filesystems) a buffered copy with a
+    1MB chunk size is used.
+
+    Args:
+        source: File object of the upload (e.g. ``UploadFile.file``)
+        destination: Path of the file to create
+    """
+    source.seek(0)
+    with open(destination, "wb") as out:
+        if hasattr(os, "copy_file_range") and getattr(source, "_rolled", False):
+            try:
+                in_fd = source.fileno()
+                out_fd = out.fileno()
+                while os.copy_file_range(in_fd, out_fd, COPY_BUFFER_SIZE * 64) > 0:
+                    pass
+                return
+            except OSError:
+                # Start over with a regular copy
+                source.seek(0)
+                out.seek(0)
+                out.truncate()
+
+        shutil.copyfileobj(source, out, length=COPY_BUFFER_SIZE)
@@ -4,113 +4,134 @@ Generates charts for missing values, distributions, and data quality metrics.
 """
 
 import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import base64
+from matplotlib.figure import Figure  # OO API: no global pyplot state, safe in worker threads
+try:
+    import pybase64 as base64  # SIMD-accelerated, same API as the stdlib module
+except ImportError:
+    import base64
 import io
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+# Threads used to render independent charts concurrently; matplotlib's Agg
+# renderer and PNG compression release the GIL for much of their work
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "4"))
 
-def generate_missing_values_chart(df: pd.DataFrame) -> Optional[str]:
+# Chart images: PNG bytes when generated with raw=True, base64 strings otherwise
+ChartImage = Union[str, bytes]
+
+
+def _render_png(fig: Figure, raw: bool = False) -> ChartImage:
+    """Render a figure to PNG bytes, base64-encoded unless raw is set."""
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
+    png = img_buffer.getvalue()
+    return png if raw else base64.b64encode(png).decode()
+
+
+def generate_missing_values_chart(
+    df: pd.DataFrame,
+    raw: bool = False,
+    null_counts: Optional[pd.Series] = None
+) -> Optional[ChartImage]:
     """
     Generate a bar chart of missing values per column.
     
     Args:
         df: Input DataFrame
+        raw: Return PNG bytes instead of a base64 string
+        null_counts: Optional precomputed df.isnull().sum()
         
     Returns:
-        Base64 encoded PNG image string or None if no missing values
+        Base64 encoded PNG image string (or bytes) or None if no missing values
     """
-    missing_counts = df.isnull().sum()
+    missing_counts = null_counts if null_counts is not None else df.isnull().sum()
     missing_counts = missing_counts[missing_counts > 0]  # Only columns with missing values
     
     if len(missing_counts) == 0:
         return None
     
     # Create figure
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(range(len(missing_counts)), missing_counts.values, color='#ff6b6b')
-    plt.xlabel('Columns', fontsize=12)
-    plt.ylabel('Missing Values Count', fontsize=12)
-    plt.title('Missing Values per Column', fontsize=14, fontweight='bold')
-    plt.xticks(range(len(missing_counts)), missing_counts.index, rotation=45, ha='right')
-    plt.grid(axis='y', alpha=0.3, linestyle='--')
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(range(len(missing_counts)), missing_counts.values, color='#ff6b6b')
+    ax.set_xlabel('Columns', fontsize=12)
+    ax.set_ylabel('Missing Values Count', fontsize=12)
+    ax.set_title('Missing Values per Column', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(len(missing_counts)))
+    ax.set_xticklabels(missing_counts.index, rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add value labels on bars
     for i, bar in enumerate(bars):
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontsize=10)
-    
-    plt.tight_layout()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}',
+               ha='center', va='bottom', fontsize=10)
     
-    # Convert to base64 string
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.read()).decode()
-    plt.close()
+    fig.tight_layout()
     
-    return img_str
+    return _render_png(fig, raw)
 
 
-def generate_missing_percentage_chart(df: pd.DataFrame) -> Optional[str]:
+def generate_missing_percentage_chart(
+    df: pd.DataFrame,
+    raw: bool = False,
+    null_counts: Optional[pd.Series] = None
+) -> Optional[ChartImage]:
     """
     Generate a bar chart of missing values percentage per column.
     
     Args:
         df: Input DataFrame
+        raw: Return PNG bytes instead of a base64 string
+        null_counts: Optional precomputed df.isnull().sum()
         
     Returns:
-        Base64 encoded PNG image string or None if no missing values
+        Base64 encoded PNG image string (or bytes) or None if no missing values
     """
-    missing_pct = (df.isnull().sum() / len(df)) * 100
+    missing_counts = null_counts if null_counts is not None else df.isnull().sum()
+    missing_pct = (missing_counts / len(df)) * 100
     missing_pct = missing_pct[missing_pct > 0]  # Only columns with missing values
     
     if len(missing_pct) == 0:
         return None
     
     # Create figure
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(range(len(missing_pct)), missing_pct.values, color='#feca57')
-    plt.xlabel('Columns', fontsize=12)
-    plt.ylabel('Missing Values Percentage (%)', fontsize=12)
-    plt.title('Missing Values Percentage per Column', fontsize=14, fontweight='bold')
-    plt.xticks(range(len(missing_pct)), missing_pct.index, rotation=45, ha='right')
-    plt.grid(axis='y', alpha=0.3, linestyle='--')
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(range(len(missing_pct)), missing_pct.values, color='#feca57')
+    ax.set_xlabel('Columns', fontsize=12)
+    ax.set_ylabel('Missing Values Percentage (%)', fontsize=12)
+    ax.set_title('Missing Values Percentage per Column', fontsize=14, fontweight='bold')
+    ax.set_xticks(range(len(missing_pct)))
+    ax.set_xticklabels(missing_pct.index, rotation=45, ha='right')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Add value labels on bars
     for i, bar in enumerate(bars):
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.1f}%',
-                ha='center', va='bottom', fontsize=10)
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{height:.1f}%',
+               ha='center', va='bottom', fontsize=10)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Convert to base64 string
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.read()).decode()
-    plt.close()
-    
-    return img_str
+    return _render_png(fig, raw)
 
 
-def generate_numeric_distribution_chart(df: pd.DataFrame, column: str) -> Optional[str]:
+def generate_numeric_distribution_chart(df: pd.DataFrame, column: str, raw: bool = False) -> Optional[ChartImage]:
     """
     Generate a histogram for a numeric column.
     
     Args:
         df: Input DataFrame
         column: Column name to plot
+        raw: Return PNG bytes instead of a base64 string
         
     Returns:
-        Base64 encoded PNG image string or None if column is not numeric
+        Base64 encoded PNG image string (or bytes) or None if column is not numeric
     """
     if column not in df.columns:
         return None
@@ -123,58 +144,52 @@ def generate_numeric_distribution_chart(df: pd.DataFrame, column: str) -> Option
             return None
         
         # Create figure
-        plt.figure(figsize=(10, 6))
-        plt.hist(numeric_data, bins=30, color='#48dbfb', edgecolor='black', alpha=0.7)
-        plt.xlabel(column, fontsize=12)
-        plt.ylabel('Frequency', fontsize=12)
-        plt.title(f'Distribution of {column}', fontsize=14, fontweight='bold')
-        plt.grid(axis='y', alpha=0.3, linestyle='--')
-        
-        plt.tight_layout()
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
+        ax.hist(numeric_data, bins=30, color='#48dbfb', edgecolor='black', alpha=0.7)
+        ax.set_xlabel(column, fontsize=12)
+        ax.set_ylabel('Frequency', fontsize=12)
+        ax.set_title(f'Distribution of {column}', fontsize=14, fontweight='bold')
+        ax.grid(axis='y', alpha=0.3, linestyle='--')
         
-        # Convert to base64 string
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_str = base64.b64encode(img_buffer.read()).decode()
-        plt.close()
+        fig.tight_layout()
         
-        return img_str
+        return _render_png(fig, raw)
     except Exception:
         return None
 
 
-def generate_all_numeric_distributions(df: pd.DataFrame, max_columns: int = 4) -> Dict[str, str]:
+def generate_all_numeric_distributions(df: pd.DataFrame, max_columns: int = 4, raw: bool = False) -> Dict[str, ChartImage]:
     """
     Generate distribution charts for all numeric columns.
     
     Args:
         df: Input DataFrame
         max_columns: Maximum number of columns to plot
+        raw: Return PNG bytes instead of a base64 string
         
     Returns:
-        Dictionary mapping column names to base64 encoded PNG strings
+        Dictionary mapping column names to base64 encoded PNG strings (or bytes)
     """
-    distributions = {}
-    numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_columns = df.select_dtypes(include=['number']).columns.tolist()[:max_columns]
+    if not numeric_columns:
+        return {}
     
-    for column in numeric_columns[:max_columns]:
-        chart = generate_numeric_distribution_chart(df, column)
-        if chart:
-            distributions[column] = chart
-    
-    return distributions
+    with ThreadPoolExecutor(max_workers=min(CHART_WORKERS, len(numeric_columns))) as pool:
+        charts = pool.map(lambda column: generate_numeric_distribution_chart(df, column, raw), numeric_columns)
+        return {column: chart for column, chart in zip(numeric_columns, charts) if chart}
 
 
-def generate_issues_severity_chart(validation_issues: List[Dict]) -> Optional[str]:
+def generate_issues_severity_chart(validation_issues: List[Dict], raw: bool = False) -> Optional[ChartImage]:
     """
     Generate a pie chart of issues by severity.
     
     Args:
         validation_issues: List of validation issue dictionaries
+        raw: Return PNG bytes instead of a base64 string
         
     Returns:
-        Base64 encoded PNG image string or None if no issues
+        Base64 encoded PNG image string (or bytes) or None if no issues
     """
     if not validation_issues:
         return None
@@ -189,7 +204,8 @@ def generate_issues_severity_chart(validation_issues: List[Dict]) -> Optional[st
         return None
     
     # Create figure
-    plt.figure(figsize=(8, 8))
+    fig = Figure(figsize=(8, 8))
+    ax = fig.subplots()
     colors = {
         'high': '#ee5a6f',
         'medium': '#feca57',
@@ -199,18 +215,11 @@ def generate_issues_severity_chart(validation_issues: List[Dict]) -> Optional[st
     sizes = list(severity_counts.values())
     chart_colors = [colors.get(s, '#999999') for s in labels]
     
-    plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90,
-            colors=chart_colors, textprops={'fontsize': 12, 'fontweight': 'bold'})
-    plt.title('Issues by Severity', fontsize=14, fontweight='bold')
-    
-    plt.tight_layout()
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90,
+           colors=chart_colors, textprops={'fontsize': 12, 'fontweight': 'bold'})
+    ax.set_title('Issues by Severity', fontsize=14, fontweight='bold')
     
-    # Convert to base64 string
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.read()).decode()
-    plt.close()
+    fig.tight_layout()
     
-    return img_str
+    return _render_png(fig, raw)
 
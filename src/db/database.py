@@ -9,7 +9,40 @@ db_dir = Path("data/db")
 db_dir.mkdir(parents=True, exist_ok=True)
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///./{db_dir}/db.sqlite3")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Connection pool size for server databases (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    # Sessions are opened per request; keep enough pooled connections for the
+    # threadpool and drop stale ones before handing them out
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True
+    )
+
+# expire_on_commit=False: objects stay readable after commit without a reload query
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
+
+_db_initialized = False
+
+
+def init_db():
+    """Create any missing tables and indexes. Runs once per process; later calls are no-ops."""
+    global _db_initialized
+    if _db_initialized:
+        return
+    import src.db.models  # noqa: F401 - registers the tables on Base
+    Base.metadata.create_all(bind=engine)
+    # create_all doesn't add indexes to existing tables; make sure databases
+    # created before an index was introduced get it too
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    _db_initialized = True
@@ -1,7 +1,7 @@
 # src/db/models.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index, select, func
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from .database import Base
 
@@ -33,6 +33,22 @@ class CheckSession(Base):
         return f"<CheckSession(filename={self.filename}, issues={self.issues_found})>"
 
 
+# Serves the newest-first history listing and its keyset pagination
+ix_check_sessions_created_at_id = Index(
+    "ix_check_sessions_created_at_id",
+    CheckSession.created_at.desc(),
+    CheckSession.id.desc()
+)
+
+# Covers the per-format counts of /metrics/usage (range on created_at, read file_format
+# from the index); the per-day counts are already covered by the index above
+ix_check_sessions_created_at_format = Index(
+    "ix_check_sessions_created_at_format",
+    CheckSession.created_at,
+    CheckSession.file_format
+)
+
+
 class Issue(Base):
     __tablename__ = "issues"
 
@@ -54,3 +70,27 @@ class Issue(Base):
 
 # Add reverse relationship to CheckSession
 CheckSession.issues = relationship("Issue", back_populates="session", cascade="all, delete-orphan")
+
+# Number of stored issues, counted in SQL; only loaded when requested with undefer()
+CheckSession.issue_count = column_property(
+    select(func.count(Issue.id))
+    .where(Issue.session_id == CheckSession.id)
+    .correlate_except(Issue)
+    .scalar_subquery(),
+    deferred=True
+)
+
+# Serves per-session issue lookups (issue counts, eager loading of session.issues)
+# and covers the per-severity counts of session comparisons
+ix_issues_session_id_severity = Index("ix_issues_session_id_severity", Issue.session_id, Issue.severity)
+
+
+class ValidationConfigModel(Base):
+    __tablename__ = "validation_configs"
+
+    config_name = Column(String, primary_key=True)
+    payload = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ValidationConfigModel(config_name={self.config_name})>"
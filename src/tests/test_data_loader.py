@@ -2,7 +2,7 @@
 
 import pytest
 import pandas as pd
-from fastapi import UploadFile
+from fastapi import UploadFile, HTTPException
 from io import BytesIO
 
 from src.core.data_loader import load_data
@@ -21,6 +21,46 @@ async def test_load_csv_file():
     assert isinstance(df, pd.DataFrame)
     assert df.shape == (2, 2)
 
+# Test that empty and NA fields load as missing values, as with pandas
+@pytest.mark.asyncio
+async def test_load_csv_missing_values():
+    csv_data = "name,age\nAlice,30\n,\nNA,25"
+    file = FakeUploadFile(content=csv_data, filename="test.csv")
+    df = await load_data(file)
+    assert df["name"].isna().tolist() == [False, True, True]
+    assert df["age"].isna().tolist() == [False, True, False]
+
+# Test that rows with missing fields are padded with NaN, as with pandas
+@pytest.mark.asyncio
+async def test_load_csv_short_row():
+    file = FakeUploadFile(content="a,b\n1,2\n3\n", filename="test.csv")
+    df = await load_data(file)
+    assert df.shape == (2, 2)
+    assert df["b"].isna().tolist() == [False, True]
+
+# Test that repeated header names are renamed, as with pandas
+@pytest.mark.asyncio
+async def test_load_csv_duplicate_headers():
+    file = FakeUploadFile(content="a,a,b\n1,2,3\n", filename="test.csv")
+    df = await load_data(file)
+    assert df.columns.tolist() == ["a", "a.1", "b"]
+
+# Test that date-like columns stay strings, as with pandas
+@pytest.mark.asyncio
+async def test_load_csv_dates_as_strings():
+    file = FakeUploadFile(content="d,ts\n2024-01-01,2024-01-01 10:00:00\n", filename="test.csv")
+    df = await load_data(file)
+    assert df["d"].tolist() == ["2024-01-01"]
+    assert df["ts"].tolist() == ["2024-01-01 10:00:00"]
+
+# Test that invalid UTF-8 is rejected instead of loaded as bytes
+@pytest.mark.asyncio
+async def test_load_csv_invalid_utf8():
+    file = UploadFile(filename="test.csv", file=BytesIO(b"a,b\n\xff\xfe,1\n"))
+    with pytest.raises(HTTPException) as exc_info:
+        await load_data(file)
+    assert exc_info.value.status_code == 500
+
 # Test loading JSON file
 @pytest.mark.asyncio
 async def test_load_json_file():
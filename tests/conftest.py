@@ -13,8 +13,16 @@ import shutil
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.db.database import SessionLocal, engine, Base
-from src.db.models import CheckSession, Issue
+from src.db.database import SessionLocal, engine, Base, init_db
+from src.db.models import CheckSession, Issue, ValidationConfigModel
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """
+    Create the tables and indexes once, as the app's lifespan does on startup.
+    """
+    init_db()
 
 
 @pytest.fixture(scope="module")
@@ -46,6 +54,27 @@ def clean_db(db_session):
     db_session.commit()
 
 
+@pytest.fixture
+def clean_validation_configs():
+    """
+    Remove stored validation configurations before and after a test.
+    """
+    from src.api.routes.config import _clear_config_cache
+    
+    def _clear():
+        session = SessionLocal()
+        try:
+            session.query(ValidationConfigModel).delete()
+            session.commit()
+        finally:
+            session.close()
+        _clear_config_cache()
+    
+    _clear()
+    yield
+    _clear()
+
+
 @pytest.fixture
 def sample_dataframe():
     """Sample DataFrame with various data quality issues."""
@@ -125,6 +154,14 @@ def setup_test_env(monkeypatch, tmp_path):
     # Set environment variables if needed
     monkeypatch.setenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8000")
     
+    # Don't serve cached health/metrics/comparison results from a previous test
+    from src.api.routes import health, metrics
+    from src.core.comparison import clear_comparison_cache
+    clear_comparison_cache()
+    monkeypatch.setattr(health, "_health_cache", (0.0, b""))
+    monkeypatch.setattr(health, "_detailed_cache", (0.0, None))
+    monkeypatch.setattr(metrics, "_summary_cache", (0.0, None))
+    
     # Cleanup after test
     yield
     # Additional cleanup if needed
@@ -459,3 +459,22 @@ class TestComparisonEndpoints:
         report_paths = data.get("report_paths", {})
         # Should have multiple formats
         assert len(report_paths) > 0
+
+
+class TestResponseCompression:
+    """Tests for gzip response compression."""
+    
+    def test_large_response_gzipped(self, client):
+        """Test that large responses are compressed when the client accepts gzip."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert "paths" in response.json()
+    
+    def test_small_response_not_gzipped(self, client):
+        """Test that responses under the minimum size are sent as is."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
@@ -120,3 +120,31 @@ class TestBatchProcessing:
         assert result["failed"] >= 0
         assert result["successful"] + result["failed"] == 2
 
+    
+    def test_batch_upload_results_keep_file_order(self, client, sample_csv_file):
+        """Test that concurrent processing reports results in upload order."""
+        from unittest.mock import patch
+        
+        def fake_report(input_path, **kwargs):
+            if input_path.name.endswith("_bad.csv"):
+                raise ValueError("broken file")
+            return {"session_id": 1}
+        
+        with open(sample_csv_file, "rb") as f:
+            content = f.read()
+        files = [
+            ("files", ("a.csv", content, "text/csv")),
+            ("files", ("bad.csv", content, "text/csv")),
+            ("files", ("c.csv", content, "text/csv")),
+        ]
+        
+        with patch("src.api.routes.batch.generate_data_quality_report", side_effect=fake_report):
+            response = client.post("/upload-batch/", files=files, data={"report_format": "md"})
+        
+        assert response.status_code == 200
+        result = response.json()
+        assert [r["filename"] for r in result["results"]] == ["a.csv", "bad.csv", "c.csv"]
+        assert [r["status"] for r in result["results"]] == ["success", "error", "success"]
+        assert result["results"][1]["error"] == "broken file"
+        assert result["successful"] == 2
+        assert result["failed"] == 1
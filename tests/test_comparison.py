@@ -180,6 +180,24 @@ class TestCompareSessions:
         assert result["comparison"]["trend"] == "stable"
         assert result["comparison"]["trend_icon"] == "➡️"
     
+    def test_compare_sessions_severity_counts(self, clean_db, db_session):
+        """Test per-severity counts, with missing severities counted as medium."""
+        sessions = []
+        for severities in (["high", "low", None], ["medium"]):
+            session = CheckSession(filename="test.csv", file_format="csv", rows=10, issues_found=len(severities))
+            db_session.add(session)
+            db_session.flush()
+            for severity in severities:
+                db_session.add(Issue(session_id=session.id, issue_type="test_issue", severity=severity))
+            sessions.append(session)
+        db_session.commit()
+        
+        result = compare_sessions(sessions[0].id, sessions[1].id, db_session)
+        
+        assert result["session1"]["issues_by_severity"] == {"high": 1, "medium": 1, "low": 1}
+        assert result["session2"]["issues_by_severity"] == {"high": 0, "medium": 1, "low": 0}
+        assert result["comparison"]["medium_severity_change"] == 0
+    
     def test_compare_sessions_not_found(self, clean_db, db_session):
         """Test comparison with non-existent sessions."""
         result = compare_sessions(999, 998, db_session)
@@ -244,6 +262,40 @@ class TestQualityTrend:
         assert result["trend"] == "no_previous_data"
         assert "message" in result
     
+    def test_get_quality_trend_cached_until_cleared(self, clean_db, db_session):
+        """Test that trend results are reused until the comparison cache is cleared."""
+        from src.core.comparison import clear_comparison_cache
+        
+        current_session = CheckSession(filename="current.csv", file_format="csv", rows=100, issues_found=10)
+        db_session.add(current_session)
+        db_session.commit()
+        
+        assert get_quality_trend(current_session.id)["trend"] == "no_previous_data"
+        
+        # Added without going through the report writer, which would clear the cache
+        db_session.add(CheckSession(filename="previous.csv", file_format="csv", rows=100, issues_found=10))
+        db_session.commit()
+        assert get_quality_trend(current_session.id)["trend"] == "no_previous_data"
+        # A caller's own session always reads fresh data
+        assert get_quality_trend(current_session.id, db_session=db_session)["trend"] == "stable"
+        
+        clear_comparison_cache()
+        assert get_quality_trend(current_session.id)["trend"] == "stable"
+    
+    def test_get_quality_trend_cached_copy(self, clean_db, db_session):
+        """Test that mutating a returned trend doesn't change the cached one."""
+        current_session = CheckSession(filename="current.csv", file_format="csv", rows=100, issues_found=10)
+        db_session.add(current_session)
+        db_session.commit()
+        
+        first = get_quality_trend(current_session.id)
+        first["trend"] = "tampered"
+        first["current_session"]["total_issues"] = -1
+        
+        second = get_quality_trend(current_session.id)
+        assert second["trend"] == "no_previous_data"
+        assert second["current_session"]["total_issues"] == 10
+    
     def test_get_quality_trend_degrading(self, clean_db, db_session):
         """Test trend analysis showing degradation."""
         # Create previous sessions with few issues
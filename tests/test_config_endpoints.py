@@ -4,7 +4,6 @@ Integration tests for configuration and validation rules endpoints.
 import pytest
 from fastapi.testclient import TestClient
 from src.api.main import app
-from src.api.routes.config import validation_configs
 
 
 pytestmark = pytest.mark.integration
@@ -17,11 +16,9 @@ def client():
 
 
 @pytest.fixture(autouse=True)
-def clean_configs():
+def clean_configs(clean_validation_configs):
     """Clean validation configs before and after each test."""
-    validation_configs.clear()
     yield
-    validation_configs.clear()
 
 
 class TestValidationConfigEndpoints:
@@ -170,3 +167,130 @@ class TestValidationConfigEndpoints:
         get_response = client.get("/config/validation-rules/test_config")
         assert get_response.status_code == 404
 
+    
+    def test_config_persisted_in_database(self, client):
+        """Test that configurations are stored in the database, not only in memory."""
+        from src.api.routes.config import _clear_config_cache
+        from src.db.database import SessionLocal
+        from src.db.models import ValidationConfigModel
+        
+        config_data = {
+            "config_name": "persisted_config",
+            "rules": [{
+                "rule_name": "test_rule",
+                "rule_type": "missing_threshold",
+                "enabled": True,
+                "parameters": {"threshold": 5}
+            }]
+        }
+        client.post("/config/validation-rules", json=config_data)
+        
+        session = SessionLocal()
+        try:
+            row = session.get(ValidationConfigModel, "persisted_config")
+            assert row is not None
+            assert row.payload["rules"][0]["parameters"] == {"threshold": 5}
+        finally:
+            session.close()
+        
+        # Still served after the process cache is dropped
+        _clear_config_cache()
+        response = client.get("/config/validation-rules/persisted_config")
+        assert response.status_code == 200
+        assert response.json()["rules"][0]["rule_name"] == "test_rule"
+    
+    def test_cached_config_refreshed_after_update(self, client):
+        """Test that a cached configuration is not served after it is updated."""
+        config_data = {
+            "config_name": "cached_config",
+            "description": "v1",
+            "rules": []
+        }
+        client.post("/config/validation-rules", json=config_data)
+        assert client.get("/config/validation-rules/cached_config").json()["description"] == "v1"
+        
+        config_data["description"] = "v2"
+        client.put("/config/validation-rules/cached_config", json=config_data)
+        
+        assert client.get("/config/validation-rules/cached_config").json()["description"] == "v2"
+    
+    def test_missing_config_not_cached(self, client):
+        """Test that a config created elsewhere (e.g. another worker) is found after a 404."""
+        from src.db.database import SessionLocal
+        from src.db.models import ValidationConfigModel
+        
+        assert client.get("/config/validation-rules/late_config").status_code == 404
+        
+        # Written directly, without clearing this process's cache
+        session = SessionLocal()
+        try:
+            session.add(ValidationConfigModel(
+                config_name="late_config",
+                payload={"config_name": "late_config", "rules": [], "description": None}
+            ))
+            session.commit()
+        finally:
+            session.close()
+        
+        assert client.get("/config/validation-rules/late_config").status_code == 200
+    
+    def test_cached_config_expires(self, client, monkeypatch):
+        """Test that cached configs are re-read from the database after the TTL."""
+        import time
+        from types import SimpleNamespace
+        from src.api.routes import config as config_module
+        from src.db.database import SessionLocal
+        from src.db.models import ValidationConfigModel
+        
+        client.post("/config/validation-rules", json={"config_name": "ttl_config", "description": "v1", "rules": []})
+        assert client.get("/config/validation-rules/ttl_config").json()["description"] == "v1"
+        
+        # Updated elsewhere, without clearing this process's cache
+        session = SessionLocal()
+        try:
+            row = session.get(ValidationConfigModel, "ttl_config")
+            row.payload = {"config_name": "ttl_config", "rules": [], "description": "v2"}
+            session.commit()
+        finally:
+            session.close()
+        
+        assert client.get("/config/validation-rules/ttl_config").json()["description"] == "v1"
+        
+        later = time.monotonic() + config_module.CONFIG_CACHE_TTL + 1
+        monkeypatch.setattr(config_module, "time", SimpleNamespace(monotonic=lambda: later))
+        assert client.get("/config/validation-rules/ttl_config").json()["description"] == "v2"
+    
+    def test_config_list_cached_until_write(self, client):
+        """Test that the config list is reused between writes and rebuilt after one."""
+        from src.api.routes import config as config_module
+        
+        client.post("/config/validation-rules", json={"config_name": "list_a", "rules": []})
+        first = client.get("/config/validation-rules").json()["configs"]
+        assert [c["config_name"] for c in first] == ["list_a"]
+        assert config_module._summary_cache[1] is not None
+        
+        client.post("/config/validation-rules", json={"config_name": "list_b", "rules": []})
+        assert config_module._summary_cache[1] is None
+        
+        second = client.get("/config/validation-rules").json()["configs"]
+        assert [c["config_name"] for c in second] == ["list_a", "list_b"]
+    
+    def test_cached_config_reads_survive_concurrent_clears(self, client):
+        """Test that cache hits racing with cache clears never raise."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.api.routes.config import _clear_config_cache, _load_config
+        
+        client.post("/config/validation-rules", json={"config_name": "racy_config", "rules": []})
+        
+        def read(_):
+            return _load_config("racy_config").config_name
+        
+        def clear(_):
+            _clear_config_cache()
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            reads = [pool.submit(read, i) for i in range(200)]
+            clears = [pool.submit(clear, i) for i in range(200)]
+            assert all(f.result() == "racy_config" for f in reads)
+            for f in clears:
+                f.result()
@@ -252,3 +252,21 @@ class TestSaveCheckToDB:
         assert check_session.issues[0].issue_type == "missing_values"
         assert check_session.issues[0].session_id == session_id
 
+    
+    def test_save_check_to_db_runs_ddl_once(self, clean_db, db_session, monkeypatch):
+        """Test that table creation is a one-shot init, not repeated per save."""
+        from unittest.mock import patch
+        from src.db import database
+        
+        monkeypatch.setattr(database, "_db_initialized", False)
+        with patch.object(Base.metadata, "create_all", wraps=Base.metadata.create_all) as create_all:
+            for name in ("first.csv", "second.csv"):
+                save_check_to_db(
+                    filename=name,
+                    file_format="csv",
+                    rows=1,
+                    validation_issues=[],
+                    db_session=db_session
+                )
+        
+        assert create_all.call_count == 1
@@ -9,8 +9,7 @@ import pandas as pd
 import tempfile
 from unittest.mock import patch, AsyncMock
 from src.api.main import app
-from src.api.routes.webhooks import webhooks, WebhookEvent
-from src.api.routes.config import validation_configs
+from src.api.routes.webhooks import WebhookEvent, _clear_webhooks
 from src.core.generate_sample_report import generate_data_quality_report
 
 
@@ -38,13 +37,11 @@ def sample_data_file(tmp_path):
 
 
 @pytest.fixture(autouse=True)
-def clean_state():
+def clean_state(clean_validation_configs):
     """Clean webhooks and configs before and after tests."""
-    webhooks.clear()
-    validation_configs.clear()
+    _clear_webhooks()
     yield
-    webhooks.clear()
-    validation_configs.clear()
+    _clear_webhooks()
 
 
 class TestE2EWorkflows:
@@ -68,10 +65,10 @@ class TestE2EWorkflows:
             files = {"file": ("test.csv", f, "text/csv")}
             data = {"report_format": "md"}  # Use valid format
             
-            with patch('src.api.routes.webhooks.httpx.AsyncClient') as mock_client:
+            with patch('src.api.routes.webhooks.get_http_client') as mock_client:
                 mock_response = AsyncMock()
                 mock_response.raise_for_status = AsyncMock()
-                mock_client.return_value.__aenter__.return_value.post = AsyncMock(return_value=mock_response)
+                mock_client.return_value.post = AsyncMock(return_value=mock_response)
                 
                 upload_response = client.post("/upload-data/", files=files, data=data)
         
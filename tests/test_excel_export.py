@@ -148,6 +148,71 @@ class TestExcelExport:
         except ImportError:
             pytest.skip("openpyxl not available for validation")
     
+    def test_save_excel_sheet_contents(self, tmp_path):
+        """Test that streamed rows land in the expected cells."""
+        openpyxl = pytest.importorskip("openpyxl")
+        df = pd.DataFrame({"age": [30, None, 40], "name": ["a", "b", None]})
+        validation_issues = [
+            {'row_number': 1, 'column_name': 'age', 'issue_type': 'missing_value',
+             'description': 'Missing age', 'severity': 'high'},
+        ]
+        
+        excel_path = save_excel(
+            df=df,
+            validation_issues=validation_issues,
+            validation_summary={'high': 1, 'medium': 0, 'low': 0},
+            filename="test_report_contents",
+            output_dir=str(tmp_path / "reports")
+        )
+        
+        wb = openpyxl.load_workbook(excel_path)
+        assert wb['Overview']['A1'].value == "Data Quality Report"
+        assert wb['Overview']['A9'].value == "Total Issues: 1"
+        assert [cell.value for cell in wb['Missing Values'][2]] == ["age", 1, "33.33%"]
+        assert [cell.value for cell in wb['Issues'][2]] == [1, "age", "missing_value", "Missing age", "high"]
+        assert wb['Issues']['E2'].fill.start_color.rgb.endswith("FF0000")
+        assert wb['Issues']['A1'].font.bold
+        assert wb['Statistics']['A2'].value == "count"
+    
+    def test_save_excel_no_issues_and_no_numeric_columns(self, tmp_path):
+        """Test the placeholder row for no issues and the skipped Statistics sheet."""
+        openpyxl = pytest.importorskip("openpyxl")
+        df = pd.DataFrame({"name": ["a", "b"]})
+        
+        excel_path = save_excel(
+            df=df,
+            validation_issues=[],
+            validation_summary={'high': 0, 'medium': 0, 'low': 0},
+            filename="test_report_empty",
+            output_dir=str(tmp_path / "reports")
+        )
+        
+        wb = openpyxl.load_workbook(excel_path)
+        assert wb['Issues']['A2'].value == "No issues found"
+        assert 'Statistics' not in wb.sheetnames
+    
+    def test_save_excel_caps_issues_at_row_limit(self, tmp_path, monkeypatch):
+        """Test that issues beyond the worksheet row limit are left out."""
+        openpyxl = pytest.importorskip("openpyxl")
+        monkeypatch.setattr("src.core.export_utils.EXCEL_MAX_ROWS", 3)
+        validation_issues = [
+            {'row_number': i, 'column_name': 'age', 'issue_type': 'outlier',
+             'description': f'Issue {i}', 'severity': 'low'}
+            for i in range(5)
+        ]
+        
+        excel_path = save_excel(
+            df=pd.DataFrame({"age": [1, 2]}),
+            validation_issues=validation_issues,
+            validation_summary={'high': 0, 'medium': 0, 'low': 5},
+            filename="test_report_capped",
+            output_dir=str(tmp_path / "reports")
+        )
+        
+        wb = openpyxl.load_workbook(excel_path)
+        assert wb['Issues'].max_row == 3
+        assert wb['Overview']['A9'].value == "Total Issues: 5"
+    
     def test_save_excel_missing_openpyxl(self, sample_dataframe, tmp_path, monkeypatch):
         """Test that ImportError is raised when openpyxl is not available."""
         # Mock import to raise ImportError
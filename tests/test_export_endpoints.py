@@ -110,3 +110,63 @@ class TestExportEndpoints:
         
         assert response.status_code == 200
 
+    
+    def test_export_history_parquet(self, client, sample_data_file):
+        """Test exporting history as Parquet."""
+        import io
+        import pyarrow.parquet as pq
+        
+        generate_data_quality_report(sample_data_file, report_format="json")
+        
+        response = client.get("/export/history?format=parquet&limit=5")
+        
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert 1 <= table.num_rows <= 5
+        assert table.column_names == ["id", "filename", "file_format", "rows", "issues_found", "created_at"]
+        assert str(table.schema.field("created_at").type) == "timestamp[us]"
+    
+    def test_export_session_json_content(self, client, create_check_session):
+        """Test that the streamed session export contains the session's issues."""
+        session_id = create_check_session
+        if not session_id:
+            pytest.skip("No session created")
+        
+        response = client.get(f"/export/session/{session_id}?format=json")
+        
+        assert response.status_code == 200
+        issues = response.json()
+        assert isinstance(issues, list)
+        for issue in issues:
+            assert set(issue) == {"row_number", "column_name", "issue_type", "description", "severity", "detected_at"}
+    
+    def test_export_history_database_error(self, client, sample_data_file):
+        """Test that a query failure is reported as a 500, not an empty download."""
+        from unittest.mock import patch
+        
+        generate_data_quality_report(sample_data_file, report_format="json")
+        
+        def failing_batches(stmt, **kwargs):
+            raise RuntimeError("database is locked")
+            yield
+        
+        with patch("src.api.routes.export._iter_batches", side_effect=failing_batches):
+            response = client.get("/export/history?format=csv")
+        
+        assert response.status_code == 500
+        assert "Export failed" in response.json()["detail"]
+    
+    def test_export_session_closed_when_download_aborted(self, sample_data_file):
+        """Test that closing the batches of an unfinished export releases its session."""
+        from unittest.mock import patch, MagicMock
+        from src.api.routes.export import _iter_batches, _close_batches
+        
+        mock_db = MagicMock()
+        mock_db.execute.return_value.partitions.return_value = iter([[(1,)], [(2,)]])
+        
+        with patch("src.api.routes.export.SessionLocal", return_value=mock_db):
+            batches = _iter_batches(MagicMock())
+            assert next(batches) == [(1,)]
+            _close_batches(batches)
+        
+        mock_db.close.assert_called_once()
@@ -12,7 +12,11 @@ from src.core.export_formats import (
     export_to_xml,
     export_to_parquet,
     export_validation_results,
-    export_data_with_metadata
+    export_data_with_metadata,
+    stream_csv,
+    stream_json,
+    stream_xml,
+    stream_parquet
 )
 
 
@@ -77,6 +81,22 @@ class TestExportFormats:
             data = json.load(f)
             assert len(data) == 3
     
+    def test_export_to_json_missing_values_and_timestamps(self, tmp_path):
+        """Test that missing values become null and timestamps ISO strings."""
+        df = pd.DataFrame({
+            "when": [pd.Timestamp("2024-01-01"), pd.NaT],
+            "value": [1.5, None]
+        })
+        output_path = tmp_path / "test_missing.json"
+        export_to_json(df, output_path)
+        
+        with open(output_path, 'r') as f:
+            data = json.load(f)
+        assert data == [
+            {"when": "2024-01-01T00:00:00", "value": 1.5},
+            {"when": None, "value": None}
+        ]
+    
     def test_export_to_json_orient(self, sample_df, tmp_path):
         """Test JSON export with different orientations."""
         output_path = tmp_path / "test_index.json"
@@ -119,6 +139,10 @@ class TestExportFormats:
             df_read = pd.read_parquet(output_path)
             assert len(df_read) == 3
             assert list(df_read.columns) == ["id", "name", "age"]
+            
+            import pyarrow.parquet as pq
+            metadata = pq.ParquetFile(output_path).metadata
+            assert metadata.row_group(0).column(0).compression == "ZSTD"
         except ImportError:
             pytest.skip("pyarrow not installed")
     
@@ -183,6 +207,21 @@ class TestExportFormats:
             assert data["metadata"]["session_id"] == 1
             assert len(data["data"]) == 3
     
+    def test_export_data_with_metadata_missing_and_dates(self, tmp_path):
+        """Test that missing values become null and datetimes ISO strings."""
+        df = pd.DataFrame({
+            "value": [1.5, None],
+            "when": pd.to_datetime(["2024-01-01", None]),
+            "name": ["a/b", "ü"]
+        })
+        output_path = tmp_path / "data_with_metadata.json"
+        export_data_with_metadata(df, {"rows": 2}, output_path)
+        
+        data = json.loads(output_path.read_text(encoding="utf-8"))
+        assert data["metadata"] == {"rows": 2}
+        assert data["data"][0] == {"value": 1.5, "when": "2024-01-01T00:00:00.000", "name": "a/b"}
+        assert data["data"][1] == {"value": None, "when": None, "name": "ü"}
+    
     def test_export_validation_results_invalid_format(self, sample_issues, tmp_path):
         """Test validation results export with invalid format."""
         output_path = tmp_path / "issues.txt"
@@ -190,3 +229,58 @@ class TestExportFormats:
         with pytest.raises(ValueError, match="Unsupported export format"):
             export_validation_results(sample_issues, output_path, format="txt")
 
+
+
+class TestStreamingExports:
+    """Tests for the batch-at-a-time export writers."""
+    
+    COLUMNS = ["id", "name"]
+    BATCHES = [[(1, "Alice"), (2, None)], [(3, "Charlie")]]
+    
+    def test_stream_csv(self):
+        """Test CSV streaming yields one chunk per batch."""
+        chunks = list(stream_csv(self.COLUMNS, self.BATCHES))
+        
+        assert len(chunks) == 2
+        assert b"".join(chunks) == b"id,name\n1,Alice\n2,\n3,Charlie\n"
+    
+    def test_stream_csv_empty(self):
+        """Test CSV streaming without rows still writes the header."""
+        assert b"".join(stream_csv(self.COLUMNS, [])) == b"id,name\n"
+    
+    def test_stream_json(self):
+        """Test JSON streaming produces a valid array of records."""
+        data = json.loads(b"".join(stream_json(self.COLUMNS, self.BATCHES)))
+        
+        assert data == [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": None},
+            {"id": 3, "name": "Charlie"}
+        ]
+        assert json.loads(b"".join(stream_json(self.COLUMNS, []))) == []
+    
+    def test_stream_xml(self):
+        """Test XML streaming produces a well-formed document."""
+        import xml.etree.ElementTree as ET
+        
+        root = ET.fromstring(b"".join(stream_xml(self.COLUMNS, self.BATCHES, "items", "item")))
+        
+        assert root.tag == "items"
+        assert len(root) == 3
+        assert root[0].find("name").text == "Alice"
+        assert not root[1].find("name").text
+    
+    def test_stream_parquet(self):
+        """Test Parquet streaming produces a readable file with one row group per batch."""
+        import io
+        import pyarrow.parquet as pq
+        
+        data = b"".join(stream_parquet([("id", int), ("name", str)], self.BATCHES))
+        
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.read().to_pylist() == [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": None},
+            {"id": 3, "name": "Charlie"}
+        ]
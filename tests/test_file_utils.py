@@ -0,0 +1,34 @@
+"""
+Unit tests for file helper utilities.
+"""
+import pytest
+import tempfile
+from src.core.utils.file_utils import copy_upload_to_path
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestCopyUploadToPath:
+    """Tests for copy_upload_to_path."""
+
+    def test_copy_in_memory_upload(self, tmp_path):
+        """Test copying an upload that is still spooled in memory."""
+        source = tempfile.SpooledTemporaryFile(max_size=1024)
+        source.write(b"id,name\n1,Alice\n")
+
+        destination = tmp_path / "upload.csv"
+        copy_upload_to_path(source, destination)
+
+        assert destination.read_bytes() == b"id,name\n1,Alice\n"
+
+    def test_copy_rolled_over_upload(self, tmp_path):
+        """Test copying an upload that was rolled over to disk."""
+        content = b"x" * (3 * 1024 * 1024)
+        source = tempfile.SpooledTemporaryFile(max_size=1024)
+        source.write(content)
+
+        destination = tmp_path / "upload.csv"
+        copy_upload_to_path(source, destination)
+
+        assert destination.read_bytes() == content
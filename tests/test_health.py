@@ -56,3 +56,41 @@ class TestHealthEndpoints:
                 assert "database" in data["components"]
                 assert "reports_directory" in data["components"]
 
+    
+    def test_health_check_body_reused_within_ttl(self, client, monkeypatch):
+        """Test that probes within the TTL get the same pre-built body."""
+        from src.api.routes import health
+        
+        first = client.get("/health")
+        second = client.get("/health")
+        assert first.headers["content-type"] == "application/json"
+        assert first.content == second.content
+        
+        monkeypatch.setattr(health, "HEALTH_TTL", 0.0)
+        monkeypatch.setattr(health, "_health_cache", (0.0, b""))
+        assert client.get("/health").json()["status"] == "healthy"
+    
+    def test_detailed_health_check_cached(self, client):
+        """Test that repeated detailed health checks within the TTL reuse the result."""
+        from unittest.mock import patch
+        
+        with patch("src.api.routes.health.psutil.cpu_percent", return_value=12.5) as mock_cpu:
+            first = client.get("/health/detailed").json()
+            second = client.get("/health/detailed").json()
+        
+        assert mock_cpu.call_count == 1
+        assert mock_cpu.call_args.kwargs.get("interval") is None
+        assert first == second
+    
+    def test_detailed_health_check_refreshed_after_ttl(self, client, monkeypatch):
+        """Test that the detailed health result is recomputed once the TTL expires."""
+        from unittest.mock import patch
+        from src.api.routes import health
+        
+        monkeypatch.setattr(health, "DETAILED_HEALTH_TTL", 0.0)
+        
+        with patch("src.api.routes.health.psutil.cpu_percent", return_value=12.5) as mock_cpu:
+            client.get("/health/detailed")
+            client.get("/health/detailed")
+        
+        assert mock_cpu.call_count == 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared HTTP client.
+"""
+import pytest
+import asyncio
+from src.core.http_client import get_http_client, close_http_client
+
+
+pytestmark = pytest.mark.unit
+
+
+class TestSharedHttpClient:
+    """Tests for get_http_client / close_http_client."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        """Test that the same client is returned within one event loop."""
+        client = get_http_client()
+        try:
+            assert get_http_client() is client
+        finally:
+            await close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_client_recreated_after_close(self):
+        """Test that a closed client is replaced on next use."""
+        client = get_http_client()
+        await close_http_client()
+
+        new_client = get_http_client()
+        try:
+            assert new_client is not client
+            assert not new_client.is_closed
+        finally:
+            await close_http_client()
+
+    def test_client_per_event_loop(self):
+        """Test that a different event loop gets its own client."""
+        async def get_client():
+            return get_http_client()
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+        asyncio.run(close_http_client())
+
+    def test_client_closed_when_its_loop_shuts_down(self):
+        """Test that a client is closed on its own loop when asyncio.run finishes."""
+        async def get_client():
+            return get_http_client()
+
+        first = asyncio.run(get_client())
+        assert first.is_closed
+
+        second = asyncio.run(get_client())
+        assert second is not first
+        asyncio.run(close_http_client())
+
+    def test_replaced_client_closed_on_running_loop(self):
+        """Test that a client replaced by another loop is closed on its own, still running loop."""
+        import threading
+        import time
+
+        async def get_client():
+            return get_http_client()
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            first = asyncio.run_coroutine_threadsafe(get_client(), loop).result()
+
+            async def replace():
+                replacement = get_http_client()
+                for _ in range(100):
+                    if first.is_closed:
+                        break
+                    await asyncio.sleep(0.01)
+                return replacement
+
+            second = asyncio.run(replace())
+            assert second is not first
+            assert first.is_closed
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            asyncio.run(close_http_client())
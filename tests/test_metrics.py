@@ -70,6 +70,25 @@ class TestMetricsEndpoints:
         
         assert data["period_days"] == 30
     
+    def test_usage_metrics_counts_consistent(self, client, sample_data_file, db_session):
+        """Test that usage statistics agree with each other and with the database."""
+        from datetime import datetime, timedelta
+        from src.db.models import CheckSession, Issue
+        
+        generate_data_quality_report(sample_data_file, report_format="json")
+        
+        stats = client.get("/metrics/usage?days=7").json()["statistics"]
+        cutoff = datetime.utcnow() - timedelta(days=7)
+        
+        assert stats["total_checks"] >= 1
+        assert stats["total_checks"] == sum(stats["checks_by_day"].values())
+        assert stats["total_checks"] == sum(stats["checks_by_format"].values())
+        assert stats["total_issues"] == db_session.query(Issue).join(CheckSession)\
+            .filter(CheckSession.created_at >= cutoff).count()
+        
+        days = list(stats["checks_by_day"])
+        assert days == sorted(days, reverse=True)
+    
     def test_metrics_summary(self, client, sample_data_file):
         """Test metrics summary endpoint."""
         # Create some check sessions first
@@ -92,3 +111,13 @@ class TestMetricsEndpoints:
         assert isinstance(data["total_issues"], int)
         assert isinstance(data["average_issues_per_check"], (int, float))
 
+    
+    def test_metrics_summary_cached(self, client, sample_data_file):
+        """Test that the summary is served from cache within the TTL."""
+        generate_data_quality_report(sample_data_file, report_format="json")
+        first = client.get("/metrics/summary").json()
+        
+        generate_data_quality_report(sample_data_file, report_format="json")
+        second = client.get("/metrics/summary").json()
+        
+        assert second == first
@@ -3,7 +3,7 @@ Unit tests for middleware components.
 Tests for logging and rate limiting middleware.
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from fastapi import Request, HTTPException, status
 from starlette.responses import Response
 from src.api.middleware.logging import RequestLoggingMiddleware
@@ -84,6 +84,19 @@ class TestRequestLoggingMiddleware:
             call_args = mock_logger.error.call_args[0][0]
             assert "Error:" in call_args
     
+    @pytest.mark.asyncio
+    async def test_skips_info_logs_when_disabled(self, middleware, mock_request, mock_response):
+        """Test that request/response lines are not built above INFO level."""
+        async def call_next(request):
+            return mock_response
+        
+        with patch('src.api.middleware.logging.logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = False
+            response = await middleware.dispatch(mock_request, call_next)
+            
+            assert not mock_logger.info.called
+            assert "X-Process-Time" in response.headers
+    
     @pytest.mark.asyncio
     async def test_process_time_header(self, middleware, mock_request, mock_response):
         """Test that process time is added to headers."""
@@ -183,6 +196,20 @@ class TestRateLimitMiddleware:
             response = await middleware.dispatch(mock_request, call_next)
             assert response.status_code == 200
     
+    @pytest.mark.asyncio
+    async def test_rate_limit_skips_preflight_requests(self, middleware, mock_request, mock_response):
+        """Test that CORS preflight requests are not counted."""
+        mock_request.method = "OPTIONS"
+        
+        async def call_next(request):
+            return mock_response
+        
+        for i in range(10):
+            response = await middleware.dispatch(mock_request, call_next)
+            assert response.status_code == 200
+        
+        assert "127.0.0.1" not in rate_limit_storage
+    
     @pytest.mark.asyncio
     async def test_rate_limit_headers(self, middleware, mock_request, mock_response):
         """Test that rate limit headers are set correctly."""
@@ -197,3 +224,122 @@ class TestRateLimitMiddleware:
         assert response.headers["X-RateLimit-Limit"] == "5"
         assert int(response.headers["X-RateLimit-Remaining"]) < 5
 
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_evicts_expired_entries(self, middleware, mock_request, mock_response):
+        """Test that timestamps outside the window are dropped."""
+        async def call_next(request):
+            return mock_response
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1000.0):
+            for i in range(5):
+                await middleware.dispatch(mock_request, call_next)
+        
+        # A minute later the old requests no longer count against the limit
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1061.0):
+            response = await middleware.dispatch(mock_request, call_next)
+        
+        assert response.headers["X-RateLimit-Remaining"] == "4"
+        assert list(rate_limit_storage["127.0.0.1"]) == [1061.0]
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_storage_is_bounded(self, mock_response):
+        """Test that idle clients are evicted and tracked clients are capped."""
+        middleware = RateLimitMiddleware(Mock(), requests_per_minute=5, max_clients=2)
+        
+        async def call_next(request):
+            return mock_response
+        
+        def request_from(ip):
+            request = Mock(spec=Request)
+            request.url.path = "/test"
+            request.client.host = ip
+            request.headers = {}
+            return request
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1000.0):
+            for ip in ["10.0.0.1", "10.0.0.2", "10.0.0.3"]:
+                await middleware.dispatch(request_from(ip), call_next)
+        
+        assert list(rate_limit_storage) == ["10.0.0.2", "10.0.0.3"]
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1061.0):
+            await middleware.dispatch(request_from("10.0.0.4"), call_next)
+        
+        assert list(rate_limit_storage) == ["10.0.0.4"]
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_retry_after_uses_oldest_request(self, middleware, mock_request, mock_response):
+        """Test that Retry-After counts down from the oldest request in the window."""
+        async def call_next(request):
+            return mock_response
+        
+        for now in [1000.0, 1010.0, 1020.0, 1030.0, 1040.0]:
+            with patch('src.api.middleware.rate_limit.time.time', return_value=now):
+                await middleware.dispatch(mock_request, call_next)
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1045.0):
+            with pytest.raises(HTTPException) as exc_info:
+                await middleware.dispatch(mock_request, call_next)
+        
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert exc_info.value.detail["retry_after"] == 15
+        assert exc_info.value.headers["Retry-After"] == "15"
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_uses_redis_when_configured(self, middleware, mock_request, mock_response):
+        """Test that a configured Redis backend is used for counting."""
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock(side_effect=[[1, True], [6, True]])
+        middleware.redis = MagicMock()
+        middleware.redis.pipeline.return_value = pipeline
+        
+        async def call_next(request):
+            return mock_response
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1000.0):
+            response = await middleware.dispatch(mock_request, call_next)
+            assert response.headers["X-RateLimit-Remaining"] == "4"
+            
+            with pytest.raises(HTTPException) as exc_info:
+                await middleware.dispatch(mock_request, call_next)
+        
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        # Window 16 (960-1020s) resets 20 seconds later
+        assert exc_info.value.detail["retry_after"] == 20
+        pipeline.incr.assert_called_with("rl:127.0.0.1:16")
+        assert not rate_limit_storage
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_falls_back_to_memory_when_redis_fails(self, middleware, mock_request, mock_response):
+        """Test that Redis errors fall back to in-memory counting."""
+        middleware.redis = MagicMock()
+        middleware.redis.pipeline.side_effect = ConnectionError("redis down")
+        
+        async def call_next(request):
+            return mock_response
+        
+        response = await middleware.dispatch(mock_request, call_next)
+        
+        assert response.status_code == 200
+        assert len(rate_limit_storage["127.0.0.1"]) == 1
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_skips_redis_after_failure(self, middleware, mock_request, mock_response):
+        """Test that Redis is not retried on every request while it is down."""
+        middleware.redis = MagicMock()
+        middleware.redis.pipeline.side_effect = ConnectionError("redis down")
+        
+        async def call_next(request):
+            return mock_response
+        
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1000.0):
+            await middleware.dispatch(mock_request, call_next)
+            await middleware.dispatch(mock_request, call_next)
+        assert middleware.redis.pipeline.call_count == 1
+        assert len(rate_limit_storage["127.0.0.1"]) == 2
+        
+        # Redis is tried again once the retry interval has passed
+        with patch('src.api.middleware.rate_limit.time.time', return_value=1031.0):
+            await middleware.dispatch(mock_request, call_next)
+        assert middleware.redis.pipeline.call_count == 2
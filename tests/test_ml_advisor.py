@@ -106,6 +106,18 @@ class TestClassImbalance:
         
         # Should have minimal or no imbalance issues
         assert isinstance(issues, list)
+    
+    def test_class_balance_ignores_missing_labels(self):
+        """Missing labels are not counted as a class; nunique is cached per column."""
+        df = pd.DataFrame({
+            "target": ["A"] * 85 + ["B"] * 5 + [None] * 10,
+            "feature1": range(100)
+        })
+        advisor = MLAdvisor(df)
+        issues = advisor._check_data_balance()
+        
+        assert any("85.0%" in issue for issue in issues)
+        assert advisor._unique_counts["target"] == 2
 
 
 class TestFeatureEngineering:
@@ -143,6 +155,25 @@ class TestFeatureEngineering:
         # Should recommend handling correlation
         assert isinstance(recs, list)
     
+    def test_high_correlation_pairs_match_pandas(self):
+        """Test that the numpy correlation path finds the same pairs as DataFrame.corr."""
+        from src.core.ml_advisor import _high_correlation_pairs
+        
+        rng = np.random.default_rng(0)
+        base = rng.normal(size=200)
+        df = pd.DataFrame({
+            "a": base,
+            "b": base * 2 + rng.normal(size=200) * 0.1,
+            "c": rng.normal(size=200),
+            "constant": np.ones(200),
+            "negated": -base
+        })
+        with_missing = df.assign(c=df["c"].where(df.index != 3))
+        
+        expected = [("a", "b"), ("a", "negated"), ("b", "negated")]
+        assert _high_correlation_pairs(df, 0.8) == expected
+        assert _high_correlation_pairs(with_missing, 0.8) == expected
+    
     def test_high_cardinality_detection(self):
         """Test detection of high cardinality categorical features."""
         # Fix: ensure same length for all columns
@@ -345,3 +376,44 @@ class TestMLAdvisorIntegration:
         assert result["readiness_score"] > 50  # Should be reasonably high
         assert isinstance(result["recommendations"], list)
 
+    
+    def test_analyze_without_numeric_columns(self):
+        """Column statistics handle frames with no numeric columns."""
+        df = pd.DataFrame({'city': ['a', 'b', 'a', 'c'], 'tier': ['x', 'x', 'y', 'y']})
+        result = MLAdvisor(df).analyze()
+        
+        assert isinstance(result["recommendations"], list)
+    
+    def test_numeric_stats_single_pass(self, sample_dataframe):
+        """Numeric column statistics are aggregated once per advisor."""
+        advisor = MLAdvisor(sample_dataframe)
+        advisor.analyze()
+        
+        assert advisor._numeric_stats is advisor._numeric_stats
+        numeric = sample_dataframe.select_dtypes(include=[np.number])
+        assert list(advisor._numeric_stats.columns) == list(numeric.columns)
+        assert advisor._numeric_stats.loc['std'].equals(numeric.std())
+    
+    def test_missing_counts_without_precomputed_nulls(self):
+        """Missing counts derived from df.count() match isnull().sum()."""
+        df = pd.DataFrame({
+            'mostly_empty': [None, None, None, 1.0],
+            'some_missing': ['a', None, 'b', 'c'],
+            'full': [1, 2, 3, 4],
+        })
+        advisor = MLAdvisor(df)
+        analysis = advisor._analyze_missing_values()
+        
+        assert advisor.null_counts.equals(df.isnull().sum())
+        assert analysis["total_missing"] == 4
+        assert any("mostly_empty" in rec for rec in analysis["recommendations"])
+        assert any("'some_missing'" in rec for rec in analysis["recommendations"])
+    
+    def test_advisor_does_not_copy_or_mutate_input(self, sample_dataframe):
+        """The advisor reads the caller's frame in place and leaves it unchanged."""
+        before = sample_dataframe.copy()
+        advisor = MLAdvisor(sample_dataframe)
+        advisor.analyze()
+        
+        assert advisor.df is sample_dataframe
+        pd.testing.assert_frame_equal(sample_dataframe, before)
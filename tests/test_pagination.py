@@ -120,6 +120,16 @@ class TestPagination:
         assert "items" in data
         assert len(data["items"]) > 0
     
+    def test_issue_count_without_full_issues(self, client, sample_data_file):
+        """Test that list pages carry issue counts and only load issue rows on request."""
+        generate_data_quality_report(sample_data_file, report_format="json")
+        
+        light = client.get("/checks/history?page=1&page_size=1").json()["items"][0]
+        full = client.get("/checks/history?page=1&page_size=1&full=true").json()["items"][0]
+        
+        assert "issues" not in light
+        assert light["issue_count"] == full["issue_count"] == len(full["issues"])
+    
     def test_pagination_empty_result(self, client, clean_db):
         """Test pagination with no results."""
         # clean_db fixture ensures empty database
@@ -161,3 +171,44 @@ class TestPagination:
         # Should return 422 validation error
         assert response.status_code == 422
 
+    
+    def test_cursor_pagination_matches_offset_pages(self, client, sample_data_file):
+        """Test that following next_cursor returns the same rows as page numbers."""
+        for i in range(12):
+            generate_data_quality_report(sample_data_file, report_format="json")
+        
+        page1 = client.get("/checks/history?page=1&page_size=5").json()
+        page2 = client.get("/checks/history?page=2&page_size=5").json()
+        
+        cursor = page1["pagination"]["next_cursor"]
+        assert cursor is not None
+        
+        response = client.get("/checks/history", params={"page_size": 5, "cursor": cursor})
+        assert response.status_code == 200
+        cursor_page = response.json()
+        
+        assert [item["id"] for item in cursor_page["items"]] == [item["id"] for item in page2["items"]]
+        
+        # Cursor pages have no page number
+        assert "page" not in cursor_page["pagination"]
+        assert "has_previous" not in cursor_page["pagination"]
+        assert cursor_page["pagination"]["has_next"] is page2["pagination"]["has_next"]
+    
+    def test_cursor_pagination_last_full_page(self, client, sample_data_file, clean_db):
+        """Test that an exactly full last page has no next cursor."""
+        for i in range(4):
+            generate_data_quality_report(sample_data_file, report_format="json")
+        
+        page1 = client.get("/checks/history?page_size=2").json()
+        assert page1["pagination"]["has_next"] is True
+        
+        page2 = client.get("/checks/history", params={"page_size": 2, "cursor": page1["pagination"]["next_cursor"]}).json()
+        assert len(page2["items"]) == 2
+        assert page2["pagination"]["has_next"] is False
+        assert page2["pagination"]["next_cursor"] is None
+    
+    def test_cursor_pagination_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/checks/history?cursor=not-a-cursor")
+        
+        assert response.status_code == 400
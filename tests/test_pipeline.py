@@ -117,6 +117,70 @@ class TestFullPipeline:
         assert result["session_id"] is not None
         assert Path(result["markdown"]).exists()
     
+    def test_pipeline_with_json_lines(self, tmp_path):
+        """Test that a JSON Lines file is detected and read record by record."""
+        df = pd.DataFrame({"id": [1, 2, 3], "value": [10, 20, None]})
+        json_path = tmp_path / "sample_lines.json"
+        df.to_json(json_path, orient='records', lines=True)
+        
+        result = generate_data_quality_report(
+            input_path=json_path,
+            report_format="md",
+            include_ai=False,
+            save_to_db=False
+        )
+        
+        assert result["validation_summary"]["dataset_rows"] == 3
+        assert result["validation_summary"]["dataset_columns"] == 2
+    
+    def test_pipeline_with_duplicate_headers(self, tmp_path):
+        """Test that repeated CSV header names are renamed and checked."""
+        csv_path = tmp_path / "duplicate_headers.csv"
+        csv_path.write_text("a,a,b\n1,2,3\n4,5,6\n")
+        
+        result = generate_data_quality_report(
+            input_path=csv_path,
+            report_format="md",
+            include_ai=False,
+            save_to_db=False
+        )
+        
+        assert result["validation_summary"]["dataset_columns"] == 3
+    
+    def test_pipeline_with_short_rows(self, tmp_path):
+        """Test that rows with missing fields are reported as missing values."""
+        csv_path = tmp_path / "short_rows.csv"
+        csv_path.write_text("a,b\n1,2\n3\n")
+        
+        result = generate_data_quality_report(
+            input_path=csv_path,
+            report_format="md",
+            include_ai=False,
+            save_to_db=False
+        )
+        
+        assert result["validation_summary"]["dataset_rows"] == 2
+        assert result["issues_count"] > 0
+    
+    def test_pipeline_scans_for_nulls_once(self, sample_data_csv, monkeypatch):
+        """Test that the missing-value counts are computed once and shared."""
+        calls = []
+        original_isnull = pd.DataFrame.isnull
+        
+        def counting_isnull(self):
+            calls.append(self.shape)
+            return original_isnull(self)
+        
+        monkeypatch.setattr(pd.DataFrame, "isnull", counting_isnull)
+        generate_data_quality_report(
+            input_path=sample_data_csv,
+            report_format="xlsx",
+            include_ai=True,
+            save_to_db=False
+        )
+        
+        assert len(calls) == 1
+    
     def test_pipeline_without_ai(self, sample_data_csv, tmp_path, clean_db):
         """Test pipeline without AI insights."""
         result = generate_data_quality_report(
@@ -142,6 +206,23 @@ class TestFullPipeline:
         assert result["issues_count"] > 0
         assert Path(result["markdown"]).exists()
     
+    def test_pipeline_with_input_buffer(self, sample_data_csv, tmp_path):
+        """Test pipeline reading the dataset from an in-memory buffer."""
+        import io
+        buffer = io.BytesIO(sample_data_csv.read_bytes())
+        
+        result = generate_data_quality_report(
+            input_path=Path("in_memory_upload.csv"),
+            report_format="md",
+            include_ai=False,
+            save_to_db=False,
+            input_buffer=buffer
+        )
+        
+        assert result["issues_count"] > 0
+        assert result["validation_summary"]["dataset_rows"] == 5
+        assert Path(result["markdown"]).name == "in_memory_upload.md"
+    
     def test_pipeline_validation_summary(self, sample_data_csv, tmp_path):
         """Test that validation summary is included."""
         result = generate_data_quality_report(
@@ -7,7 +7,8 @@ pytestmark = pytest.mark.unit
 import pandas as pd
 from pathlib import Path
 from src.core.reporting import generate_markdown_report
-from src.core.export_utils import save_markdown, save_html, save_pdf, render_template
+from unittest.mock import patch
+from src.core.export_utils import save_markdown, save_html, save_pdf, save_pdf_async, render_template
 from src.core.visualizations import (
     generate_missing_values_chart,
     generate_issues_severity_chart
@@ -125,6 +126,31 @@ class TestReportExport:
             # Should contain img tags or base64 data if visualizations were added
             assert len(content) > 0
     
+    def test_save_html_writes_raw_charts_as_assets(self, sample_dataframe, tmp_path):
+        """Test that PNG bytes are saved next to the report and linked, not inlined."""
+        reports_dir = tmp_path / "reports"
+        visualizations = {
+            "missing_values": generate_missing_values_chart(sample_dataframe, raw=True),
+            "numeric_distributions": {"salary": b"\x89PNG-salary"}
+        }
+        
+        result_path = save_html("# Report", "viz report", str(reports_dir), visualizations=visualizations)
+        
+        content = Path(result_path).read_text(encoding="utf-8")
+        assert "data:image/png;base64" not in content
+        assert 'src="assets/viz%20report_missing_values.png"' in content
+        assert 'src="assets/viz%20report_distribution_0.png"' in content
+        assert (reports_dir / "assets" / "viz report_missing_values.png").read_bytes().startswith(b"\x89PNG")
+        assert (reports_dir / "assets" / "viz report_distribution_0.png").read_bytes() == b"\x89PNG-salary"
+    
+    def test_save_html_reuses_rendered_body(self, tmp_path):
+        """Test that a pre-rendered body is used instead of parsing the Markdown again."""
+        with patch("src.core.export_utils.render_markdown") as render:
+            result_path = save_html("# Ignored", "prerendered", str(tmp_path), html_body="<p>shared</p>")
+        
+        render.assert_not_called()
+        assert "<p>shared</p>" in Path(result_path).read_text(encoding="utf-8")
+    
     def test_save_pdf(self, sample_dataframe, tmp_path):
         """Test saving PDF report."""
         reports_dir = tmp_path / "reports"
@@ -151,6 +177,31 @@ class TestReportExport:
         assert isinstance(result, str)
         assert "Test" in result
         assert "{{content}}" not in result  # Should be replaced
+    
+    def test_render_template_reads_file_once(self, tmp_path):
+        """Test that the template is read from disk only once per path."""
+        template_path = tmp_path / "cached_template.html"
+        template_path.write_text("<main>{{content}}</main>")
+        
+        first = render_template("<p>one</p>", str(template_path))
+        template_path.write_text("changed on disk")
+        second = render_template("<p>two</p>", str(template_path))
+        
+        assert first == "<main><p>one</p></main>"
+        assert second == "<main><p>two</p></main>"
+    
+    @pytest.mark.asyncio
+    async def test_save_pdf_async_renders_from_string(self, tmp_path):
+        """Test that the async PDF export renders HTML in memory off the event loop."""
+        with patch("src.core.export_utils._pdfkit_configuration", return_value=None), \
+                patch("pdfkit.from_string") as from_string:
+            pdf_path = await save_pdf_async("# Report", "async_report", str(tmp_path))
+        
+        assert pdf_path == str(tmp_path / "async_report.pdf")
+        html, target = from_string.call_args.args
+        assert "<h1>Report</h1>" in html
+        assert target == pdf_path
+        assert not list(tmp_path.glob("*.temp.html"))
 
 
 class TestReportGenerationPipeline:
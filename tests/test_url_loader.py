@@ -3,12 +3,19 @@ Tests for URL loader module.
 Tests downloading files from URLs with various scenarios.
 """
 import pytest
-from unittest.mock import patch, Mock, mock_open
+import httpx
+from unittest.mock import patch
 from pathlib import Path
 from fastapi import HTTPException
 from src.core.url_loader import download_file_from_url
 
 
+def mock_client(handler):
+    """Patch the shared HTTP client with one answering requests via ``handler``."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch('src.core.url_loader.get_http_client', return_value=client)
+
+
 @pytest.mark.unit
 class TestUrlLoader:
     """Tests for URL loader functionality."""
@@ -23,182 +30,168 @@ class TestUrlLoader:
         assert "Invalid URL scheme" in exc_info.value.detail
     
     @pytest.mark.asyncio
-    async def test_download_file_success_csv(self, tmp_path, monkeypatch):
+    async def test_download_file_success_csv(self):
         """Test successful download of CSV file."""
-        # Mock requests.get
-        mock_response = Mock()
-        mock_response.headers = {
-            'content-type': 'text/csv',
-            'Content-Disposition': 'attachment; filename="data.csv"'
-        }
-        mock_response.raise_for_status = Mock()
-        mock_response.iter_content.return_value = [b"id,name\n1,Alice\n2,Bob"]
-        
-        # Mock temp directory
-        test_dir = tmp_path / "tmp" / "uploads"
-        test_dir.mkdir(parents=True, exist_ok=True)
-        
-        with patch('src.core.url_loader.requests.get', return_value=mock_response):
-            with patch('src.core.url_loader.Path') as mock_path:
-                mock_path.return_value = test_dir
-                
-                # Mock the path operations
-                with patch('src.core.url_loader.Path.mkdir'):
-                    result = await download_file_from_url("http://example.com/data.csv")
-                    
-                    assert result is not None
-                    assert isinstance(result, Path)
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={
+                    'content-type': 'text/csv',
+                    'Content-Disposition': 'attachment; filename="data.csv"'
+                },
+                content=b"id,name\n1,Alice\n2,Bob"
+            )
+        
+        with mock_client(handler):
+            result = await download_file_from_url("http://example.com/data.csv")
+        
+        try:
+            assert isinstance(result, Path)
+            assert result.name.endswith("_data.csv")
+            assert result.read_bytes() == b"id,name\n1,Alice\n2,Bob"
+        finally:
+            result.unlink(missing_ok=True)
     
     @pytest.mark.asyncio
     async def test_download_file_timeout(self):
         """Test timeout handling."""
-        import requests
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
         
-        with patch('src.core.url_loader.requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.Timeout()
-            
+        with mock_client(handler):
             with pytest.raises(HTTPException) as exc_info:
                 await download_file_from_url("http://example.com/file.csv")
-            
-            assert exc_info.value.status_code == 408
+        
+        assert exc_info.value.status_code == 408
     
     @pytest.mark.asyncio
     async def test_download_file_connection_error(self):
         """Test connection error handling."""
-        import requests
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
         
-        with patch('src.core.url_loader.requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError()
-            
+        with mock_client(handler):
             with pytest.raises(HTTPException) as exc_info:
                 await download_file_from_url("http://example.com/file.csv")
-            
-            assert exc_info.value.status_code == 503
+        
+        assert exc_info.value.status_code == 503
     
     @pytest.mark.asyncio
     async def test_download_file_http_error(self):
         """Test HTTP error handling."""
-        import requests
-        
-        mock_response = Mock()
-        mock_response.status_code = 404
-        
-        http_error = requests.exceptions.HTTPError()
-        http_error.response = mock_response
-        
-        with patch('src.core.url_loader.requests.get') as mock_get:
-            mock_get.side_effect = http_error
-            
+        with mock_client(lambda request: httpx.Response(404)):
             with pytest.raises(HTTPException) as exc_info:
                 await download_file_from_url("http://example.com/file.csv")
-            
-            assert exc_info.value.status_code == 404
+        
+        assert exc_info.value.status_code == 404
     
     @pytest.mark.asyncio
     async def test_download_file_request_exception(self):
         """Test general request exception handling."""
-        import requests
+        def handler(request):
+            raise httpx.TooManyRedirects("Network error", request=request)
         
-        with patch('src.core.url_loader.requests.get') as mock_get:
-            mock_get.side_effect = requests.exceptions.RequestException("Network error")
-            
+        with mock_client(handler):
             with pytest.raises(HTTPException) as exc_info:
                 await download_file_from_url("http://example.com/file.csv")
-            
-            assert exc_info.value.status_code == 400
+        
+        assert exc_info.value.status_code == 400
     
     @pytest.mark.asyncio
-    async def test_download_file_empty_response(self, tmp_path):
+    async def test_download_file_empty_response(self):
         """Test handling of empty file."""
-        mock_response = Mock()
-        mock_response.headers = {'content-type': 'text/csv'}
-        mock_response.raise_for_status = Mock()
-        mock_response.iter_content.return_value = [b""]  # Empty content
+        handler = lambda request: httpx.Response(200, headers={'content-type': 'text/csv'}, content=b"")
         
-        test_dir = tmp_path / "tmp" / "uploads"
-        test_dir.mkdir(parents=True, exist_ok=True)
+        with mock_client(handler):
+            with pytest.raises(HTTPException) as exc_info:
+                await download_file_from_url("http://example.com/empty.csv")
         
-        with patch('src.core.url_loader.requests.get', return_value=mock_response):
-            with patch('src.core.url_loader.Path') as mock_path_class:
-                # Create a mock path that exists and has size 0
-                mock_file_path = Mock()
-                mock_file_path.stat.return_value.st_size = 0
-                mock_file_path.unlink = Mock()
-                
-                mock_dir_path = Mock()
-                mock_dir_path.__truediv__ = lambda self, other: mock_file_path
-                mock_dir_path.mkdir = Mock()
-                
-                mock_path_class.return_value = mock_dir_path
-                
-                try:
-                    await download_file_from_url("http://example.com/empty.csv")
-                    # May succeed if mocking doesn't work perfectly, that's OK
-                except (HTTPException, Exception) as e:
-                    # Should return error for empty file (400 or 500 from mocking issues)
-                    if isinstance(e, HTTPException):
-                        assert e.status_code in [400, 500]  # Allow both as mocking may affect behavior
-                    # Or may raise other exception if mocking incomplete - that's acceptable
-                    pass
-                # Test passes if code executes without unexpected errors
+        assert exc_info.value.status_code in [400, 500]
+        assert "empty" in exc_info.value.detail.lower()
     
     @pytest.mark.asyncio
-    async def test_download_file_large_file(self, tmp_path):
+    async def test_download_file_large_file(self):
         """Test handling of file too large."""
-        mock_response = Mock()
-        mock_response.headers = {'content-type': 'text/csv'}
-        mock_response.raise_for_status = Mock()
-        mock_response.iter_content.return_value = [b"x" * 1024]  # Some content
+        handler = lambda request: httpx.Response(200, headers={'content-type': 'text/csv'}, content=b"x" * 1024)
         
-        test_dir = tmp_path / "tmp" / "uploads"
-        test_dir.mkdir(parents=True, exist_ok=True)
-        
-        with patch('src.core.url_loader.requests.get', return_value=mock_response):
+        with mock_client(handler):
             with patch('src.core.url_loader.Path') as mock_path_class:
                 # Create a mock path with size > 100MB
-                mock_file_path = Mock()
-                mock_file_path.stat.return_value.st_size = 101 * 1024 * 1024  # 101MB
-                mock_file_path.unlink = Mock()
-                
-                mock_dir_path = Mock()
-                mock_dir_path.__truediv__ = lambda self, other: mock_file_path
-                mock_dir_path.mkdir = Mock()
-                
+                mock_file_path = Path("tmp/uploads") / "large_test.csv"
+                mock_dir_path = type("Dir", (), {"__truediv__": lambda self, other: mock_file_path})()
                 mock_path_class.return_value = mock_dir_path
                 
-                try:
-                    await download_file_from_url("http://example.com/large.csv")
-                    # May succeed if mocking doesn't work perfectly
-                except (HTTPException, Exception) as e:
-                    # Should return error for too large file (400 or 500 from mocking issues)
-                    if isinstance(e, HTTPException):
-                        assert e.status_code in [400, 500]  # Allow both as mocking may affect behavior
-                    # Or may raise other exception if mocking incomplete - that's acceptable
-                    pass
-                # Test passes if code executes without unexpected errors
+                with patch.object(Path, "stat") as mock_stat:
+                    mock_stat.return_value.st_size = 101 * 1024 * 1024  # 101MB
+                    with pytest.raises(HTTPException) as exc_info:
+                        await download_file_from_url("http://example.com/large.csv")
+        
+        assert exc_info.value.status_code in [400, 500]
+        assert "too large" in exc_info.value.detail.lower()
+        assert not mock_file_path.exists()
     
     @pytest.mark.asyncio
-    async def test_download_file_content_disposition(self, tmp_path):
+    async def test_download_file_content_disposition(self):
         """Test filename extraction from Content-Disposition header."""
-        mock_response = Mock()
-        mock_response.headers = {
-            'content-type': 'text/csv',
-            'Content-Disposition': 'attachment; filename="downloaded_file.csv"'
-        }
-        mock_response.raise_for_status = Mock()
-        mock_response.iter_content.return_value = [b"id,name\n1,Alice"]
-        
-        test_dir = tmp_path / "tmp" / "uploads"
-        test_dir.mkdir(parents=True, exist_ok=True)
-        
-        with patch('src.core.url_loader.requests.get', return_value=mock_response):
-            # This will test the Content-Disposition parsing logic
-            # The actual file saving part is complex to mock, so we just verify it doesn't crash
-            try:
-                with patch('src.core.url_loader.Path') as mock_path:
-                    mock_path.return_value = test_dir
-                    await download_file_from_url("http://example.com/data.csv")
-            except (AttributeError, TypeError):
-                # Expected if mocking is incomplete, but logic was tested
-                pass
-
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={
+                    'content-type': 'text/csv',
+                    'Content-Disposition': 'attachment; filename="downloaded_file.csv"'
+                },
+                content=b"id,name\n1,Alice"
+            )
+        
+        with mock_client(handler):
+            result = await download_file_from_url("http://example.com/export?id=1")
+        
+        try:
+            assert result.name.endswith("_downloaded_file.csv")
+        finally:
+            result.unlink(missing_ok=True)
+    
+    @pytest.mark.asyncio
+    async def test_download_rejects_declared_oversized_file(self):
+        """A Content-Length over the limit is refused before any body is read."""
+        async def body():
+            raise AssertionError("body should not be streamed")
+            yield b""
+        
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/csv', 'content-length': str(101 * 1024 * 1024)},
+                content=body()
+            )
+        
+        with mock_client(handler):
+            with pytest.raises(HTTPException) as exc_info:
+                await download_file_from_url("http://example.com/huge.csv")
+        
+        assert exc_info.value.status_code == 400
+        assert "too large" in exc_info.value.detail.lower()
+    
+    @pytest.mark.asyncio
+    async def test_download_aborts_mid_stream_when_too_large(self):
+        """Undeclared bodies are cut off once they pass the limit, leaving no file behind."""
+        from src.core.utils.file_utils import UPLOAD_DIR
+        chunks_sent = []
+        
+        async def body():
+            for _ in range(10):
+                chunks_sent.append(1)
+                yield b"x" * 64
+        
+        handler = lambda request: httpx.Response(200, headers={'content-type': 'text/csv'}, content=body())
+        before = set(UPLOAD_DIR.glob("url_*_big.csv"))
+        
+        with mock_client(handler), patch('src.core.url_loader.MAX_DOWNLOAD_SIZE', 100), \
+                patch('src.core.url_loader.DOWNLOAD_CHUNK_SIZE', 64):
+            with pytest.raises(HTTPException) as exc_info:
+                await download_file_from_url("http://example.com/big.csv")
+        
+        assert exc_info.value.status_code == 400
+        assert "too large" in exc_info.value.detail.lower()
+        assert len(chunks_sent) < 10
+        assert set(UPLOAD_DIR.glob("url_*_big.csv")) == before
@@ -32,6 +32,13 @@ class TestMissingValuesChart:
         except Exception:
             pytest.fail("Chart should be valid base64 encoded image")
     
+    def test_generate_missing_values_chart_raw_bytes(self, sample_dataframe):
+        """Test that raw=True returns the PNG bytes the base64 form encodes."""
+        raw_chart = generate_missing_values_chart(sample_dataframe, raw=True)
+        
+        assert isinstance(raw_chart, bytes)
+        assert raw_chart.startswith(b"\x89PNG")
+    
     def test_generate_missing_values_chart_no_missing(self, clean_dataframe):
         """Test chart generation when there are no missing values."""
         chart = generate_missing_values_chart(clean_dataframe)
@@ -1,11 +1,16 @@
 """
 Integration tests for webhook endpoints.
 """
+import asyncio
 import pytest
 from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 from src.api.main import app
-from src.api.routes.webhooks import webhooks, WebhookEvent
+from src.api.routes import webhooks as webhooks_module
+from src.api.routes.webhooks import (
+    WebhookEvent, WebhookConfig, send_webhook, send_webhooks, _save_webhook,
+    enqueue_webhooks, start_webhook_workers, stop_webhook_workers
+)
 
 
 pytestmark = pytest.mark.integration
@@ -20,9 +25,9 @@ def client():
 @pytest.fixture(autouse=True)
 def clean_webhooks():
     """Clean webhooks before and after each test."""
-    webhooks.clear()
+    webhooks_module._clear_webhooks()
     yield
-    webhooks.clear()
+    webhooks_module._clear_webhooks()
 
 
 class TestWebhookEndpoints:
@@ -137,8 +142,8 @@ class TestWebhookEndpoints:
         get_response = client.get("/webhooks/test_webhook")
         assert get_response.status_code == 404
     
-    @patch('src.api.routes.webhooks.httpx.AsyncClient')
-    def test_test_webhook_endpoint(self, mock_async_client, client):
+    @patch('src.api.routes.webhooks.get_http_client')
+    def test_test_webhook_endpoint(self, mock_get_client, client):
         """Test test webhook endpoint."""
         # Create webhook first
         webhook_data = {
@@ -154,11 +159,244 @@ class TestWebhookEndpoints:
         mock_response.raise_for_status = AsyncMock()
         mock_client = AsyncMock()
         mock_client.post = AsyncMock(return_value=mock_response)
-        mock_async_client.return_value.__aenter__.return_value = mock_client
+        mock_get_client.return_value = mock_client
         
         # Test webhook
         response = client.post("/webhooks/test_webhook/test")
         
         assert response.status_code == 200
         assert "test webhook sent" in response.json()["message"].lower()
+        mock_client.post.assert_called_once()
 
+
+class TestWebhookDelivery:
+    """Tests for webhook delivery helpers."""
+    
+    @pytest.mark.asyncio
+    async def test_send_webhooks_notifies_all_webhooks(self):
+        """Test that an event is sent to every configured webhook."""
+        for webhook_id in ("first", "second"):
+            _save_webhook(webhook_id, WebhookConfig(
+                url="https://example.com/webhook",
+                events=[WebhookEvent.CHECK_COMPLETED]
+            ))
+        
+        with patch('src.api.routes.webhooks.send_webhook', new_callable=AsyncMock) as mock_send:
+            await send_webhooks(WebhookEvent.CHECK_COMPLETED, {"session_id": 1})
+        
+        called_ids = sorted(call.args[0] for call in mock_send.call_args_list)
+        assert called_ids == ["first", "second"]
+    
+    @pytest.mark.asyncio
+    async def test_send_webhooks_skips_unsubscribed_and_disabled(self):
+        """Test that only enabled webhooks subscribed to the event are notified."""
+        _save_webhook("subscribed", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        _save_webhook("other_event", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.BATCH_COMPLETED]
+        ))
+        _save_webhook("disabled", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED],
+            enabled=False
+        ))
+        
+        with patch('src.api.routes.webhooks.send_webhook', new_callable=AsyncMock) as mock_send:
+            await send_webhooks(WebhookEvent.CHECK_COMPLETED, {"session_id": 1})
+        
+        assert [call.args[0] for call in mock_send.call_args_list] == ["subscribed"]
+    
+    def test_subscriber_index_follows_updates(self, client):
+        """Test that the event index tracks created, updated and deleted webhooks."""
+        client.post("/webhooks", json={
+            "webhook_id": "indexed",
+            "url": "https://example.com/webhook",
+            "events": ["check.completed"]
+        })
+        subscribers = webhooks_module._state.subscribers
+        assert subscribers[WebhookEvent.CHECK_COMPLETED] == {"indexed"}
+        
+        client.put("/webhooks/indexed", json={
+            "url": "https://example.com/webhook",
+            "events": ["batch.completed"]
+        })
+        subscribers = webhooks_module._state.subscribers
+        assert WebhookEvent.CHECK_COMPLETED not in subscribers
+        assert subscribers[WebhookEvent.BATCH_COMPLETED] == {"indexed"}
+        
+        client.delete("/webhooks/indexed")
+        assert webhooks_module._state.subscribers == {}
+    
+    def test_dispatch_keeps_its_snapshot_during_updates(self, client):
+        """Test that writers publish a new snapshot instead of mutating the one being read."""
+        _save_webhook("stable", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        snapshot = webhooks_module._state
+        
+        client.delete("/webhooks/stable")
+        
+        assert "stable" in snapshot.webhooks
+        assert "stable" not in webhooks_module._state.webhooks
+        with pytest.raises(TypeError):
+            snapshot.webhooks["other"] = snapshot.webhooks["stable"]
+    
+    def test_webhook_config_precomputes_delivery_fields(self):
+        """Test that the URL string and event set are derived, not request fields."""
+        config = WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED, WebhookEvent.CHECK_COMPLETED]
+        )
+        
+        assert config.url_str == "https://example.com/webhook"
+        assert config.events_set == frozenset({WebhookEvent.CHECK_COMPLETED})
+        assert "url_str" not in WebhookConfig.model_json_schema()["properties"]
+        assert "events_set" not in config.model_dump()
+    
+    @pytest.mark.asyncio
+    async def test_send_webhook_retries_with_backoff(self, monkeypatch):
+        """Test that a failed delivery is retried before giving up."""
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_RETRY_BACKOFF", 0)
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_RETRY_JITTER", 0)
+        _save_webhook("flaky", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        mock_response = AsyncMock()
+        mock_response.raise_for_status = lambda: None
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(side_effect=[Exception("boom"), mock_response])
+        
+        with patch('src.api.routes.webhooks.get_http_client', return_value=mock_client):
+            await send_webhook("flaky", WebhookEvent.CHECK_COMPLETED, {"session_id": 1})
+        
+        assert mock_client.post.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_send_webhook_signs_sent_bytes(self):
+        """Test that the signature is computed over the exact request body."""
+        import hashlib
+        import hmac
+        import json
+        import httpx
+        
+        _save_webhook("signed", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED],
+            secret="s3cret"
+        ))
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch('src.api.routes.webhooks.get_http_client', return_value=client):
+            await send_webhook("signed", WebhookEvent.CHECK_COMPLETED, {"session_id": 1})
+        await client.aclose()
+        
+        body = requests[0].content
+        expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert requests[0].headers["X-Webhook-Signature"] == f"sha256={expected}"
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert json.loads(body)["data"] == {"session_id": 1}
+    
+    @pytest.mark.asyncio
+    async def test_send_webhook_does_not_retry_client_errors(self, monkeypatch):
+        """Test that a 4xx response is not retried."""
+        import httpx
+        
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_RETRY_BACKOFF", 0)
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_RETRY_JITTER", 0)
+        _save_webhook("gone", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+        
+        with patch('src.api.routes.webhooks.get_http_client', return_value=client):
+            await send_webhook("gone", WebhookEvent.CHECK_COMPLETED, {"session_id": 1})
+        await client.aclose()
+        
+        assert webhooks_module._breakers["gone"][0] == 1
+    
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_skips_failing_webhook_until_cooldown(self, monkeypatch):
+        """Test that a repeatedly failing webhook is skipped, then retried after the cool-down."""
+        from types import SimpleNamespace
+        
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_MAX_ATTEMPTS", 1)
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_BREAKER_THRESHOLD", 2)
+        _save_webhook("dead", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(side_effect=Exception("connection refused"))
+        
+        with patch('src.api.routes.webhooks.get_http_client', return_value=mock_client):
+            for _ in range(3):
+                await send_webhook("dead", WebhookEvent.CHECK_COMPLETED, {})
+            assert mock_client.post.await_count == 2
+            
+            later = webhooks_module.time.monotonic() + webhooks_module.WEBHOOK_BREAKER_COOLDOWN + 1
+            monkeypatch.setattr(webhooks_module, "time", SimpleNamespace(monotonic=lambda: later))
+            await send_webhook("dead", WebhookEvent.CHECK_COMPLETED, {})
+            await send_webhook("dead", WebhookEvent.CHECK_COMPLETED, {})
+        
+        # One trial delivery after the cool-down, which failed and reopened the breaker
+        assert mock_client.post.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_webhooks_drains_queue_on_stop(self):
+        """Test that queued events are delivered before the workers stop."""
+        _save_webhook("first", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.BATCH_COMPLETED]
+        ))
+        
+        with patch('src.api.routes.webhooks.send_webhooks', new_callable=AsyncMock) as mock_send:
+            start_webhook_workers()
+            try:
+                assert enqueue_webhooks(WebhookEvent.BATCH_COMPLETED, {"total_files": 2}) is True
+            finally:
+                await stop_webhook_workers()
+        
+        mock_send.assert_awaited_once_with(WebhookEvent.BATCH_COMPLETED, {"total_files": 2})
+        assert webhooks_module._event_workers == []
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_webhooks_drops_when_full(self, monkeypatch):
+        """Test that events are dropped rather than queued without bound."""
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_QUEUE_SIZE", 1)
+        monkeypatch.setattr(webhooks_module, "WEBHOOK_WORKERS", 0)
+        _save_webhook("first", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        
+        start_webhook_workers()
+        try:
+            assert enqueue_webhooks(WebhookEvent.CHECK_COMPLETED, {"n": 1}) is True
+            assert enqueue_webhooks(WebhookEvent.CHECK_COMPLETED, {"n": 2}) is False
+        finally:
+            await stop_webhook_workers()
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_webhooks_without_workers_delivers_directly(self):
+        """Test that events are still delivered when the lifespan hasn't started workers."""
+        _save_webhook("first", WebhookConfig(
+            url="https://example.com/webhook",
+            events=[WebhookEvent.CHECK_COMPLETED]
+        ))
+        
+        with patch('src.api.routes.webhooks.send_webhooks', new_callable=AsyncMock) as mock_send:
+            assert enqueue_webhooks(WebhookEvent.CHECK_COMPLETED, {"n": 1}) is True
+            await asyncio.gather(*webhooks_module._fallback_deliveries)
+        
+        mock_send.assert_awaited_once_with(WebhookEvent.CHECK_COMPLETED, {"n": 1})